@@ -0,0 +1,224 @@
+#
+#    Copyright (c) 2026 Tom Keffer <tkeffer@gmail.com>
+#
+#    See the file LICENSE.txt for your full rights.
+#
+"""Benchmark the stages of a WLK import, using synthetic .WLK files.
+
+Each stage is timed over the whole set of files, then run once more under tracemalloc to find
+its peak memory. The report gives records per second, bytes of .WLK file per second, and the
+peak memory of every stage. Nothing is read from, or written to, a WeeWX installation.
+
+Usage:
+
+    python3 bench_import.py [--months 12] [--repeat 3] [--dir DIR]
+
+Without --dir, the files are written to a temporary directory, then deleted.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from synthetic_wlk import RAIN_COLLECTORS, wlk, write_archive
+
+
+def supported_collectors() -> list[int]:
+    """The rain collector types the importer can decode."""
+    supported = []
+    for collector in RAIN_COLLECTORS:
+        try:
+            wlk.decode_rain({'rain': collector}, 'rain')
+        except ValueError:
+            continue
+        supported.append(collector)
+    return supported
+
+
+def _header_parse(paths: list[Path]) -> int:
+    size = wlk.header_struct.size
+    for path in paths:
+        with open(path, 'rb') as fd:
+            wlk.parse_header(fd.read(size))
+    return len(paths)
+
+
+def _weather_records(paths: list[Path]) -> list[tuple[int, int, int, list[tuple]]]:
+    """Unpack the weather data records of every day. Returns (year, month, day, tuples)."""
+    days = []
+    for path in paths:
+        year, month = wlk.wlk_year_month(path)
+        buffer = path.read_bytes()
+        _, day_indexes = wlk.parse_header(buffer)
+        for day_index in day_indexes[1:]:
+            if day_index.records_in_day <= 0:
+                continue
+            start = wlk.header_struct.size + 88 * day_index.start_pos
+            tuples = [wlk.weather_data_struct.unpack_from(buffer, offset)
+                      for offset in range(start, start + 88 * day_index.records_in_day, 88)]
+            days.append((year, month, day_index.day_in_month,
+                         [t for t in tuples if t[0] == 1]))
+    return days
+
+
+def _record_unpack(paths: list[Path]) -> int:
+    return sum(len(tuples) for *_, tuples in _weather_records(paths))
+
+
+def _stage_on_records(func: Callable[[list], int]) -> Callable[[list[Path]], int]:
+    """Make a stage that works on records already unpacked, so only func is measured."""
+    def stage(paths: list[Path]) -> int:
+        return func(stage.days)
+    stage.setup = lambda paths: setattr(stage, 'days', _weather_records(paths))
+    return stage
+
+
+@_stage_on_records
+def _record_convert(days) -> int:
+    decode = wlk.compile_decoder(2, 1)
+    count = 0
+    for *_, tuples in days:
+        for data_tuple in tuples:
+            decode(data_tuple)
+            count += 1
+    return count
+
+
+@_stage_on_records
+def _timestamp_decode_time(days) -> int:
+    index = wlk.weather_data_names.index('packed_time')
+    count = 0
+    for year, month, day, tuples in days:
+        for data_tuple in tuples:
+            wlk.decode_time(year, month, day, data_tuple[index])
+            count += 1
+    return count
+
+
+@_stage_on_records
+def _timestamp_midnight(days) -> int:
+    index = wlk.weather_data_names.index('packed_time')
+    count = 0
+    for year, month, day, tuples in days:
+        midnight, regular = wlk.local_midnight(year, month, day)
+        for data_tuple in tuples:
+            if regular:
+                midnight + 60 * data_tuple[index]
+            else:
+                wlk.decode_time(year, month, day, data_tuple[index])
+            count += 1
+    return count
+
+
+def _python_engine(paths: list[Path]) -> int:
+    return sum(1 for path in paths for _ in wlk.gen_wlk(path))
+
+
+def _numpy_columns(paths: list[Path]) -> int:
+    return sum(len(wlk.decode_wlk_columns(path)['dateTime']) for path in paths)
+
+
+def _numpy_engine(paths: list[Path]) -> int:
+    return sum(1 for path in paths for _ in wlk.gen_wlk_columnar(path))
+
+
+def _csv_path(engine: str) -> Callable[[list[Path]], int]:
+    def stage(paths: list[Path]) -> int:
+        records = wlk.gen_files(paths, wlk.select_engine(engine))
+        with open(os.devnull, 'w', newline='') as csvfile:
+            return wlk.write_csv(csvfile, wlk.archive_fieldnames(), records)
+    return stage
+
+
+def _driver_path(engine: str) -> Callable[[list[Path]], int]:
+    def stage(paths: list[Path]) -> int:
+        driver = wlk.WLKDriver({'wlk_files': [str(p) for p in paths], 'engine': engine})
+        return sum(1 for _ in driver.genArchiveRecords(None))
+    return stage
+
+
+def stages() -> list[tuple[str, Callable[[list[Path]], int]]]:
+    """The stages to benchmark, as (name, function). Each function takes the list of files and
+    returns how many records (files, for the header stage) it processed."""
+    result = [
+        ('header parse', _header_parse),
+        ('record unpack', _record_unpack),
+        ('record convert', _record_convert),
+        ('timestamp decode_time', _timestamp_decode_time),
+        ('timestamp midnight', _timestamp_midnight),
+        ('python engine', _python_engine),
+        ('csv (python)', _csv_path('python')),
+        ('driver (python)', _driver_path('python')),
+    ]
+    if wlk._get_numpy() is not None:
+        result += [
+            ('numpy columns', _numpy_columns),
+            ('numpy engine', _numpy_engine),
+            ('csv (numpy)', _csv_path('numpy')),
+            ('driver (numpy)', _driver_path('numpy')),
+        ]
+    return result
+
+
+def run(paths: list[Path], repeat: int = 3, memory: bool = True) -> list[dict]:
+    """Run every stage. Returns one result per stage, with the best time of the repeats."""
+    total_bytes = sum(path.stat().st_size for path in paths)
+    results = []
+    for name, stage in stages():
+        if hasattr(stage, 'setup'):
+            stage.setup(paths)
+        best = None
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            count = stage(paths)
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        peak = None
+        if memory:
+            tracemalloc.start()
+            stage(paths)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        results.append({'stage': name, 'count': count, 'seconds': best,
+                        'per_second': count / best, 'bytes_per_second': total_bytes / best,
+                        'peak_bytes': peak})
+    return results
+
+
+def print_report(results: list[dict], paths: list[Path]):
+    total_bytes = sum(path.stat().st_size for path in paths)
+    print(f"{len(paths)} files, {total_bytes / 1e6:.1f} MB")
+    print(f"{'stage':<24}{'items':>9}{'seconds':>10}{'items/s':>12}{'MB/s':>10}{'peak MB':>10}")
+    for r in results:
+        peak = f"{r['peak_bytes'] / 1e6:10.1f}" if r['peak_bytes'] is not None else f"{'-':>10}"
+        print(f"{r['stage']:<24}{r['count']:>9}{r['seconds']:>10.3f}{r['per_second']:>12,.0f}"
+              f"{r['bytes_per_second'] / 1e6:>10.1f}{peak}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the stages of a WLK import.")
+    parser.add_argument("--months", type=int, default=12,
+                        help="Number of monthly files to generate. Default is 12.")
+    parser.add_argument("--interval", type=int, default=5,
+                        help="Archive interval of the files, in minutes. Default is 5.")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Times to run each stage. The best time is reported. Default is 3.")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip measuring the peak memory of each stage.")
+    parser.add_argument("--dir",
+                        help="Directory for the generated files. They are kept afterwards.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = write_archive(args.dir or tmpdir, months=args.months, interval=args.interval,
+                              rain_collectors=supported_collectors())
+        print_report(run(paths, args.repeat, not args.no_memory), paths)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#
+#    Copyright (c) 2026 Tom Keffer <tkeffer@gmail.com>
+#
+#    See the file LICENSE.txt for your full rights.
+#
+"""Benchmark the startup latency of the importer.
+
+Each case runs in a fresh Python process, so that nothing is imported already. The report gives
+the median and best wall time of each case, over a number of runs. The 'eager' case first
+imports what the importer used to import when it was loaded: the Vantage driver, which brings
+in the WeeWX engine, weeutil, and NumPy. Comparing it with the plain import shows what loading
+those lazily saves on every invocation.
+
+Usage:
+
+    python3 bench_startup.py [--runs 20]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic_wlk import wlk, write_wlk
+
+SCRIPT = Path(__file__).resolve().parent.parent / 'bin' / 'user' / 'import-wlk.py'
+
+LOAD = f"""
+import importlib.util
+spec = importlib.util.spec_from_file_location('import_wlk', {str(SCRIPT)!r})
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+"""
+
+# Modules that the importer should no longer load unless they are needed.
+HEAVY = ('numpy', 'weeutil.weeutil', 'weewx.drivers.vantage', 'weewx.engine')
+
+
+def cases(path: Path) -> list[tuple[str, list[str]]]:
+    """The commands to time, as (name, argv)."""
+    python = [sys.executable]
+    result = [
+        ('python', python + ['-c', 'pass']),
+        ('import (eager)', python + ['-c', 'import weewx.drivers.vantage, weeutil.weeutil\n'
+                                           'try:\n    import numpy\nexcept ImportError:\n'
+                                           '    pass\n' + LOAD]),
+        ('import', python + ['-c', LOAD]),
+        ('convert (python)', python + [str(SCRIPT), '--engine', 'python',
+                                       '--output', os.devnull, str(path)]),
+    ]
+    if wlk._get_numpy() is not None:
+        result.append(('convert (numpy)', python + [str(SCRIPT), '--engine', 'numpy',
+                                                    '--output', os.devnull, str(path)]))
+    return result
+
+
+def loaded_modules() -> list[str]:
+    """Which of the HEAVY modules a plain import of the importer loads."""
+    code = LOAD + (f"import sys\n"
+                   f"print(' '.join(name for name in {HEAVY!r} if name in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True,
+                            text=True).stdout
+    return output.split()
+
+
+def run(path: Path, runs: int = 20) -> list[dict]:
+    """Time every case. Returns one result per case, in seconds."""
+    results = []
+    for name, argv in cases(path):
+        times = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            subprocess.run(argv, check=True, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL)
+            times.append(time.perf_counter() - t0)
+        results.append({'case': name, 'median': statistics.median(times), 'best': min(times)})
+    return results
+
+
+def print_report(results: list[dict]):
+    print(f"{'case':<20}{'median ms':>12}{'best ms':>10}")
+    for r in results:
+        print(f"{r['case']:<20}{r['median'] * 1000:>12.1f}{r['best'] * 1000:>10.1f}")
+    medians = {r['case']: r['median'] for r in results}
+    print(f"Lazy loading saves {(medians['import (eager)'] - medians['import']) * 1000:.1f} ms "
+          f"per invocation.")
+    loaded = loaded_modules()
+    print(f"Loaded by a plain import: "
+          f"{', '.join(loaded) if loaded else 'none of ' + ', '.join(HEAVY)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the startup latency of the importer.")
+    parser.add_argument("--runs", type=int, default=20,
+                        help="Times to run each case. Default is 20.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = write_wlk(tmpdir, 2018, 1, days=[1])
+        print_report(run(path, args.runs))
+
+
+if __name__ == "__main__":
+    main()
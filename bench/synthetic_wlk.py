@@ -0,0 +1,283 @@
+#
+#    Copyright (c) 2026 Tom Keffer <tkeffer@gmail.com>
+#
+#    See the file LICENSE.txt for your full rights.
+#
+"""Write synthetic, but valid, WeatherLink .WLK files.
+
+The files have a WDAT5 header with a DayIndex table, the two daily summary records at the start
+of each day, and weather data records with smoothly varying values. A fraction of the values
+are dash values, and the extra sensors a station rarely has are always dashes. Each file uses a
+single rain collector type, which can be any of the types WeatherLink knows.
+
+Usage:
+
+    python3 synthetic_wlk.py --months 12 --start 2018-01 OUTPUT_DIR
+"""
+from __future__ import annotations
+
+import argparse
+import calendar
+import importlib.util
+import math
+import os
+import random
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+
+# Rain collector type codes, and the size of one bucket tip in inches
+RAIN_COLLECTORS = {
+    0x0000: 0.1,  # 0.1 inch
+    0x1000: 0.01,  # 0.01 inch
+    0x2000: 0.007874,  # 0.2 mm
+    0x3000: 0.0393701,  # 1.0 mm
+    0x6000: 0.00393701,  # 0.1 mm
+}
+
+
+def load_wlk_module():
+    """Load bin/user/import-wlk.py, whose name is not a valid module name."""
+    path = Path(__file__).resolve().parent.parent / 'bin' / 'user' / 'import-wlk.py'
+    spec = importlib.util.spec_from_file_location('import_wlk', path)
+    module = importlib.util.module_from_spec(spec)
+    # Register it, so worker processes can find its functions.
+    sys.modules['import_wlk'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+wlk = load_wlk_module()
+
+
+def pack_12bit(values: list[int], size: int) -> bytes:
+    """Pack 12-bit values two to every three bytes. The inverse of wlk.unpack_12bit()."""
+    buffer = bytearray(size)
+    for i, val in enumerate(values):
+        group = 3 * (i // 2)
+        if i % 2 == 0:
+            buffer[group] = val & 0xFF
+            buffer[group + 2] |= (val >> 8) & 0x0F
+        else:
+            buffer[group + 1] = val & 0xFF
+            buffer[group + 2] |= (val >> 4) & 0xF0
+    return bytes(buffer)
+
+
+def _weather_record(rng: random.Random, packed_time: int, interval: int,
+                    rain_collector: int, dash_fraction: float) -> tuple[dict, bytes]:
+    """Make one weather data record. Returns its raw values, and the packed record."""
+    hour = packed_time / 60.0
+    # Diurnal cycle, peaking mid-afternoon
+    diurnal = math.sin((hour - 9.0) * math.pi / 12.0)
+    sun = max(0.0, math.sin((hour - 6.0) * math.pi / 12.0))
+
+    out_temp = int(550 + 150 * diurnal + rng.gauss(0, 10))
+    raining = rng.random() < 0.05
+    rain_clicks = rng.randint(1, 20) if raining else 0
+    wind_speed = max(0, int(rng.gauss(60, 30)))
+    raw = {
+        'dataType': 1,
+        'interval': interval,
+        'iconFlags': 0,
+        'moreFlags': 0,
+        'packed_time': packed_time,
+        'outTemp': out_temp,
+        'highOutTemp': out_temp + rng.randint(0, 10),
+        'lowOutTemp': out_temp - rng.randint(0, 10),
+        'inTemp': int(700 + 20 * diurnal),
+        'barometer': int(30000 + 200 * math.sin(packed_time / 700.0) + rng.gauss(0, 5)),
+        'outHumidity': min(1000, max(0, int(600 - 250 * diurnal + rng.gauss(0, 20)))),
+        'inHumidity': 450,
+        'rain': rain_collector | rain_clicks,
+        'hiRainRate': rain_collector | (rain_clicks * 12 if raining else 0),
+        'windSpeed': wind_speed,
+        'windGust': wind_speed + rng.randint(0, 80),
+        'windDir': rng.randint(0, 15),
+        'windGustDir': rng.randint(0, 15),
+        'wind_samples': int(960 * interval / 41) - rng.randint(0, 5),
+        'radiation': int(900 * sun),
+        'highRadiation': int(950 * sun),
+        'UV': int(80 * sun),
+        'highUV': int(90 * sun),
+        'extraRad': 0,
+        'forecastRule': rng.randint(0, 190),
+        'ET': rng.randint(0, 3) if sun > 0 else 0,
+    }
+    # Sensors a station may not have
+    for name in wlk.weather_data_names:
+        if name.startswith(('leafTemp', 'soilTemp', 'extraTemp')):
+            raw[name] = 0xFF if name[-1] > '2' else int(out_temp / 10) + 90
+        elif name.startswith(('soilMoist', 'leafWet', 'extraHumid')):
+            raw[name] = 0xFF if name[-1] > '2' else rng.randint(0, 15)
+        elif name.startswith('newSensors'):
+            raw[name] = 0
+
+    # Knock out some values, using each field's dash value
+    for name, dash in (('outTemp', 0x7FFF), ('highOutTemp', -32768), ('lowOutTemp', 0x7FFF),
+                       ('outHumidity', 0xFF), ('windSpeed', 0xFF), ('windGust', 0xFF),
+                       ('windDir', 0xFF), ('windGustDir', 0xFF), ('radiation', 0x7FFF),
+                       ('highRadiation', 0x7FFF), ('UV', 0xFF), ('highUV', 0xFF),
+                       ('barometer', 0), ('forecastRule', 193)):
+        if rng.random() < dash_fraction:
+            raw[name] = dash
+
+    packed = wlk.weather_data_struct.pack(*(raw[name] for name in wlk.weather_data_names))
+    return raw, packed
+
+
+def _extreme(records: list[dict], name: str, dash, pick) -> tuple[int, int]:
+    """Find the high or low of a field, and its packed time. Returns dashes if there is
+    no valid value."""
+    valid = [(r[name], r['packed_time']) for r in records if r[name] != dash]
+    if not valid:
+        return -32768, 0xFFF
+    return pick(valid, key=lambda v: v[0])
+
+
+def _average(records: list[dict], name: str, dash) -> int:
+    """Average the valid values of a field. Returns a dash if there are none."""
+    valid = [r[name] for r in records if r[name] != dash]
+    return int(sum(valid) / len(valid)) if valid else -32768
+
+
+def _dashes(names: tuple, formats: tuple) -> dict:
+    """Return the dash value of each field of a record layout."""
+    dash = {'h': -32768, 'H': 0xFFFF, 'B': 0xFF}
+    return {name: dash.get(fmt, bytes(int(fmt[:-1] or 1))) for name, fmt in zip(names, formats)}
+
+
+def _summary_records(records: list[dict], rain_bucket: float) -> tuple[bytes, bytes]:
+    """Make the two daily summary records for a day's weather records. Fields the weather
+    records cannot supply, such as the dewpoint, are left as dashes."""
+    extremes = {
+        'hiOutTemp': _extreme(records, 'highOutTemp', -32768, max),
+        'lowOutTemp': _extreme(records, 'lowOutTemp', 0x7FFF, min),
+        'hiInTemp': _extreme(records, 'inTemp', 0x7FFF, max),
+        'lowInTemp': _extreme(records, 'inTemp', 0x7FFF, min),
+        'hiOutHum': _extreme(records, 'outHumidity', 0xFF, max),
+        'lowOutHum': _extreme(records, 'outHumidity', 0xFF, min),
+        'hiInHum': _extreme(records, 'inHumidity', 0xFF, max),
+        'lowInHum': _extreme(records, 'inHumidity', 0xFF, min),
+        'hiBar': _extreme(records, 'barometer', 0, max),
+        'lowBar': _extreme(records, 'barometer', 0, min),
+        'hiSpeed': _extreme(records, 'windGust', 0xFF, max),
+        'hiRainRate': _extreme(records, 'hiRainRate', -1, max),
+        'hiUV': _extreme(records, 'highUV', 0xFF, max),
+        'hiSolar': _extreme(records, 'highRadiation', 0x7FFF, max),
+    }
+    rain_clicks = sum(r['rain'] & 0x0FFF for r in records)
+    rate_clicks, _ = extremes['hiRainRate']
+    extremes['hiRainRate'] = (int(round((rate_clicks & 0x0FFF) * rain_bucket * 100)),
+                              extremes['hiRainRate'][1])
+    avg_speed = _average(records, 'windSpeed', 0xFF)
+
+    values1 = _dashes(wlk.daily_summary1_names, wlk.daily_summary1_formats)
+    values1.update({name: val for name, (val, _) in extremes.items() if name in values1})
+    values1.update({
+        'dataType': 2, 'reserved': 0,
+        'dataSpan': sum(r['interval'] for r in records),
+        'avgOutTemp': _average(records, 'outTemp', 0x7FFF),
+        'avgInTemp': _average(records, 'inTemp', 0x7FFF),
+        'avgOutHum': _average(records, 'outHumidity', 0xFF),
+        'avgBar': _average(records, 'barometer', 0),
+        'avgSpeed': avg_speed,
+        'dailyWindRunTotal': avg_speed * 24 if avg_speed != -32768 else -32768,
+        'dailyRainTotal': int(round(rain_clicks * rain_bucket * 1000)),
+        'hiUV': extremes['hiUV'][0] if extremes['hiUV'][0] != -32768 else 0xFF,
+        'timeValues': pack_12bit([extremes[name][1] if name in extremes else 0xFFF
+                                  for name in wlk.daily_summary1_times], 27),
+    })
+    values2 = _dashes(wlk.daily_summary2_names, wlk.daily_summary2_formats)
+    values2.update({
+        'dataType': 3, 'reserved': 0, 'todaysWeather': 0,
+        'numWindPackets': min(sum(r['wind_samples'] for r in records), 32767),
+        'hiSolar': extremes['hiSolar'][0],
+        'minSunlight': sum(r['interval'] for r in records
+                           if r['radiation'] != 0x7FFF and r['radiation'] > 150),
+        'dailyETTotal': sum(r['ET'] for r in records),
+        'dirBins': pack_12bit([sum(1 for r in records if r['windDir'] == d) for d in range(16)],
+                              24),
+        'timeValues': pack_12bit([extremes['hiSolar'][1]] + [0xFFF] * 9, 15),
+    })
+    return (wlk.daily_summary1_struct.pack(*(values1[n] for n in wlk.daily_summary1_names)),
+            wlk.daily_summary2_struct.pack(*(values2[n] for n in wlk.daily_summary2_names)))
+
+
+def write_wlk(directory: str, year: int, month: int, interval: int = 5,
+              days: list[int] | None = None, rain_collector: int = 0x1000,
+              dash_fraction: float = 0.01, seed: int = 0) -> Path:
+    """Write a synthetic .WLK file for a month, named YYYY-MM.wlk, into a directory.
+
+    Args:
+        directory: Where to put the file.
+        year, month: The month the file covers.
+        interval: The archive interval in minutes.
+        days: The days of the month to include. Default is all of them.
+        rain_collector: The rain collector type code. One of the keys of RAIN_COLLECTORS.
+        dash_fraction: The fraction of values that are replaced by dash values.
+        seed: Seed for the random number generator.
+
+    Returns:
+        The path of the file.
+    """
+    rng = random.Random(seed * 10000 + year * 100 + month)
+    if days is None:
+        days = range(1, calendar.monthrange(year, month)[1] + 1)
+
+    day_index = [(0, 0)] * 32
+    body = []
+    for day in days:
+        raw_records = []
+        packed_records = []
+        for packed_time in range(interval, 1441, interval):
+            raw, packed = _weather_record(rng, packed_time, interval, rain_collector,
+                                          dash_fraction)
+            raw_records.append(raw)
+            packed_records.append(packed)
+        summary1, summary2 = _summary_records(raw_records, RAIN_COLLECTORS[rain_collector])
+        day_index[day] = (len(packed_records) + 2, len(body))
+        body.extend([summary1, summary2] + packed_records)
+
+    header = wlk.header_struct.pack(b'WDAT5.0\0\0\0\0\0\0\0\x05\0', len(body),
+                                    *(wlk.DayIndex.day_index_struct.pack(*entry)
+                                      for entry in day_index))
+    path = Path(directory) / f'{year:04d}-{month:02d}.wlk'
+    with open(path, 'wb') as fd:
+        fd.write(header)
+        fd.write(b''.join(body))
+    return path
+
+
+def write_archive(directory: str, start_year: int = 2018, start_month: int = 1,
+                  months: int = 12, rain_collectors: Iterable[int] = tuple(RAIN_COLLECTORS),
+                  **kwargs) -> list[Path]:
+    """Write consecutive months of synthetic .WLK files. The rain collector type cycles
+    through rain_collectors, one per month. Other arguments are passed on to write_wlk().
+    Returns their paths."""
+    os.makedirs(directory, exist_ok=True)
+    collectors = list(rain_collectors)
+    paths = []
+    for i in range(months):
+        year, month = start_year + (start_month - 1 + i) // 12, (start_month - 1 + i) % 12 + 1
+        paths.append(write_wlk(directory, year, month,
+                               rain_collector=collectors[i % len(collectors)], **kwargs))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic WeatherLink .WLK files.")
+    parser.add_argument("directory", help="Output directory")
+    parser.add_argument("--start", default='2018-01', help="First month, as YYYY-MM")
+    parser.add_argument("--months", type=int, default=12, help="Number of months")
+    parser.add_argument("--interval", type=int, default=5, help="Archive interval in minutes")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    year, month = (int(v) for v in args.start.split('-'))
+    for path in write_archive(args.directory, year, month, args.months,
+                              interval=args.interval, seed=args.seed):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -147,7 +147,7 @@ Type		rainCollectorType
 0.01 inch	0x1000
 0.2 mm		0x2000
 1.0 mm		0x3000
-0.1 mm		0x6000 (not fully supported)
+0.1 mm		0x6000
 
 Use the rainCollectorType to interpret the hiRainRate field. For example, if you have
 a 0.01 in rain collector, a rain rate value of 19 = 0.19 in/hr = 4.8 mm/hr, but if you have
@@ -157,25 +157,56 @@ a 0.2 mm rain collector, a rain rate value of 19 = 3.8 mm/hr = 0.15 in/hr.
 from __future__ import annotations
 
 import argparse
+import array
+import calendar
+import collections
+import contextlib
 import datetime
+import functools
 import glob
+import hashlib
+import itertools
+import json
+import logging
+import mmap
 import os.path
 import struct
-from collections.abc import Iterator, Iterable
+import sys
+import time
+import zipfile
+from collections.abc import Iterator, Iterable, Mapping, Sequence
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 
-import weeutil.weeutil
 import weewx
 import weewx.drivers
-import weewx.drivers.vantage
-from weeutil.weeutil import to_int
+
+log = logging.getLogger(__name__)
+
+
+# NumPy, once _get_numpy() has imported it. None until then, or if it cannot be imported.
+numpy = None
+
+
+@functools.lru_cache(maxsize=None)
+def _get_numpy():
+    """Import NumPy on first use, so that the paths that never use it do not pay for loading it.
+    Returns None if NumPy is not installed, or fails to import."""
+    global numpy
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+    return numpy
+
 
 def loader(config_dict, _):
     if 'WLK' not in config_dict:
         raise weewx.UnsupportedFeature("WLK driver requires a 'WLK' section "
                                        "in the configuration file.")
-    return WLKDriver(config_dict['WLK'])
+    # The database the engine saves archive records in
+    binding = config_dict.get('StdArchive', {}).get('data_binding', 'wx_binding')
+    return WLKDriver(config_dict['WLK'], binding)
 
 
 class DayIndex:
@@ -204,13 +235,66 @@ header_block = [
 # Needs to be 88 bytes long:
 daily_summary1 = [
     ('B', 'dataType'),  # = 2
-    ('87s', 'unused'),
+    ('B', 'reserved'),
+    ('h', 'dataSpan'),  # total # of minutes accounted for by physical records for this day
+    ('h', 'hiOutTemp'),  # tenths of a degree F
+    ('h', 'lowOutTemp'),
+    ('h', 'hiInTemp'),
+    ('h', 'lowInTemp'),
+    ('h', 'avgOutTemp'),
+    ('h', 'avgInTemp'),
+    ('h', 'hiChill'),
+    ('h', 'lowChill'),
+    ('h', 'hiDew'),
+    ('h', 'lowDew'),
+    ('h', 'avgChill'),
+    ('h', 'avgDew'),
+    ('h', 'hiOutHum'),  # tenths of a percent
+    ('h', 'lowOutHum'),
+    ('h', 'hiInHum'),
+    ('h', 'lowInHum'),
+    ('h', 'avgOutHum'),
+    ('h', 'hiBar'),  # thousandths of an inch Hg
+    ('h', 'lowBar'),
+    ('h', 'avgBar'),
+    ('h', 'hiSpeed'),  # tenths of an MPH
+    ('h', 'avgSpeed'),
+    ('h', 'dailyWindRunTotal'),  # tenths of a mile
+    ('h', 'hi10MinSpeed'),  # tenths of an MPH
+    ('B', 'dirHiSpeed'),  # direction code (0-15, 255)
+    ('B', 'hi10MinDir'),
+    ('h', 'dailyRainTotal'),  # thousandths of an inch
+    ('h', 'hiRainRate'),  # hundredths of an inch/hr
+    ('h', 'dailyUVDose'),  # tenths of a standard MED
+    ('B', 'hiUV'),  # tenth of a UV Index
+    ('27s', 'timeValues'),  # 18 packed time values
 ]
 
 # Needs to be 88 bytes long:
 daily_summary2 = [
     ('B', 'dataType'),  # = 3
-    ('87s', 'unused')
+    ('B', 'reserved'),
+    ('H', 'todaysWeather'),  # bitmapped weather conditions. Not used.
+    ('h', 'numWindPackets'),  # # of valid packets containing wind data
+    ('h', 'hiSolar'),  # Watts per meter squared
+    ('h', 'dailySolarEnergy'),  # tenths of a Langley
+    ('h', 'minSunlight'),  # minutes where the average solar radiation was over 150
+    ('h', 'dailyETTotal'),  # thousandths of an inch
+    ('h', 'hiHeat'),  # tenths of a degree F
+    ('h', 'lowHeat'),
+    ('h', 'avgHeat'),
+    ('h', 'hiTHSW'),
+    ('h', 'lowTHSW'),
+    ('h', 'hiTHW'),
+    ('h', 'lowTHW'),
+    ('h', 'integratedHeatDD65'),  # tenths of a degree F - day
+    ('h', 'hiWetBulb'),  # tenths of a degree F
+    ('h', 'lowWetBulb'),
+    ('h', 'avgWetBulb'),
+    ('24s', 'dirBins'),  # 16 packed direction bins
+    ('15s', 'timeValues'),  # 10 packed time values
+    ('h', 'integratedCoolDD65'),  # tenths of a degree F - day
+    ('11s', 'reserved2'),
 ]
 
 # This should be 88 bytes long:
@@ -287,6 +371,14 @@ weather_data_formats, weather_data_names = zip(*weather_data_record)
 weather_data_struct = struct.Struct('<' + ''.join(weather_data_formats))
 assert weather_data_struct.size == 88
 
+daily_summary1_formats, daily_summary1_names = zip(*daily_summary1)
+daily_summary1_struct = struct.Struct('<' + ''.join(daily_summary1_formats))
+assert daily_summary1_struct.size == 88
+
+daily_summary2_formats, daily_summary2_names = zip(*daily_summary2)
+daily_summary2_struct = struct.Struct('<' + ''.join(daily_summary2_formats))
+assert daily_summary2_struct.size == 88
+
 header_formats, header_names = zip(*header_block)
 header_struct = struct.Struct('<' + ''.join(header_formats))
 
@@ -295,6 +387,23 @@ VANTAGE_MODEL_TYPE = 2
 VANTAGE_ISS_ID = 1
 
 
+def wlk_year_month(path: Path) -> tuple[int, int]:
+    """Get the year and month of a .WLK file from its name, which is of the form YYYY-MM.wlk"""
+    year_str, month_str = path.stem.split('-')
+    return int(year_str), int(month_str)
+
+
+def end_of_day(year: int, month: int, day: int) -> int:
+    """Return the unix epoch time of the local midnight that ends a day. It is the latest
+    timestamp any record of that day can have."""
+    return int(time.mktime((year, month, day + 1, 0, 0, 0, 0, 0, -1)))
+
+
+def end_of_month(year: int, month: int) -> int:
+    """Return the unix epoch time of the local midnight that ends a month."""
+    return int(time.mktime((year + month // 12, month % 12 + 1, 1, 0, 0, 0, 0, 0, -1)))
+
+
 def decode_time(year: int, month: int, day: int, packed_time: int) -> int:
     """Convert a packed time into unix epoch time."""
     if not 0 <= packed_time <= 1440:
@@ -303,23 +412,38 @@ def decode_time(year: int, month: int, day: int, packed_time: int) -> int:
     return int(dt.timestamp())
 
 
+def local_midnight(year: int, month: int, day: int) -> tuple[int, bool]:
+    """Return the unix epoch time of the local midnight that starts a day, and whether the day
+    is a regular 24-hour day. On a regular day, a packed time converts to
+    midnight + 60 * packed_time. On a day with a DST transition, use decode_time()."""
+    midnight = datetime.datetime(year, month, day, 0, 0, 0)
+    start_ts = int(midnight.timestamp())
+    stop_ts = int((midnight + datetime.timedelta(days=1)).timestamp())
+    return start_ts, stop_ts - start_ts == 86400
+
+
+# The size of one bucket tip in inches, indexed by the rain collector type in the upper nibble
+# of the rain fields. None marks an unknown type.
+rain_bucket_sizes = (
+    0.1,  # 0x0000 = 0.1 inch
+    0.01,  # 0x1000 = 0.01 inch
+    0.007874,  # 0x2000 = 0.2 mm
+    0.0393701,  # 0x3000 = 1.0 mm
+    None,
+    None,
+    0.00393701,  # 0x6000 = 0.1 mm
+) + (None,) * 9
+
+
 def decode_rain(raw_archive_record: dict, key: str) -> float:
     """Decode the rain field from a raw archive record."""
+    value = raw_archive_record[key] & 0xFFFF
     # Collector type is in the upper nibble
-    rain_collector_type = (raw_archive_record[key] & 0xF000)
+    bucket_size = rain_bucket_sizes[value >> 12]
+    if bucket_size is None:
+        raise ValueError(f"Unknown rain collector type: {value & 0xF000}")
     # Clicks in the lower 3 nibbles
-    rain_clicks = (raw_archive_record[key] & 0x0FFF)
-    if rain_collector_type == 0x0000:
-        bucket_size = 0.1
-    elif rain_collector_type == 0x1000:
-        bucket_size = 0.01
-    elif rain_collector_type == 0x2000:
-        bucket_size = 0.007874  # = 0.2 mm
-    elif rain_collector_type == 0x3000:
-        bucket_size = 0.0393701  # = 1.0 mm
-    else:
-        raise ValueError(f"Unknown rain collector type: {rain_collector_type}")
-    return rain_clicks * bucket_size
+    return (value & 0x0FFF) * bucket_size
 
 
 def decode_record(raw_archive_record: dict, vantage_model, vantage_iss_id) -> dict:
@@ -329,16 +453,16 @@ def decode_record(raw_archive_record: dict, vantage_model, vantage_iss_id) -> di
         # Divide archive interval by 60 to keep consistent with wview
         'interval': int(raw_archive_record['interval']),
     }
-    archive_record['rxCheckPercent'] = \
-        weewx.drivers.vantage._rxcheck(vantage_model,
-                                       archive_record['interval'],
-                                       vantage_iss_id,
-                                       raw_archive_record['wind_samples'])
+    archive_record['rxCheckPercent'] = rxcheck(vantage_model,
+                                               archive_record['interval'],
+                                               vantage_iss_id,
+                                               raw_archive_record['wind_samples'])
 
     for obs_type in raw_archive_record:
-        # Get the mapping function for this type. If there is no such
-        # function, supply a lambda function that will just return None
-        func = archive_map.get(obs_type, lambda p, k: None)
+        # Get the mapping function for this type. Skip types without one.
+        func = archive_map.get(obs_type)
+        if func is None:
+            continue
         # Call the function:
         val = func(raw_archive_record, obs_type)
         # Skip all null values
@@ -348,110 +472,1427 @@ def decode_record(raw_archive_record: dict, vantage_model, vantage_iss_id) -> di
     return archive_record
 
 
-# Make a copy of the archive map, so we can modify it without affecting the original. Then add
-# any specialized mappings.
-archive_map = weewx.drivers.vantage._archive_map.copy()
-archive_map['inHumidity'] = lambda p, k: float(p[k]) / 10.0 if p[k] != 0xff else None
-archive_map['outHumidity'] = lambda p, k: float(p[k]) / 10.0 if p[k] != 0xff else None
-archive_map['windSpeed'] = lambda p, k: float(p[k]) / 10.0 if p[k] != 0xff else None
-archive_map['windGust'] = lambda p, k: float(p[k]) / 10.0 if p[k] != 0xff else None
-archive_map['rain'] = decode_rain
-archive_map['hiRainRate'] = decode_rain
+def rxcheck(model_type: int, interval: int, iss_id: int,
+            number_of_wind_samples: int) -> Optional[float]:
+    """Estimate the percentage of ISS packets received. The same formula as the Vantage
+    driver's.
+
+    Ref: Vantage Serial Protocol doc, V2.1.0, released 25-Jan-05; p42"""
+    # The formula for the expected # of packets varies with model number.
+    if model_type == 1:
+        expected_packets = float(interval * 60) / (2.5 + (iss_id - 1) / 16.0) - \
+                           float(interval * 60) / (50.0 + (iss_id - 1) * 1.25)
+    elif model_type == 2:
+        expected_packets = 960.0 * interval / float(41 + iss_id - 1)
+    else:
+        return None
+    return min(number_of_wind_samples * 100.0 / expected_packets, 100.0)
+
+
+# The archive map of the Vantage driver, with the changes a .WLK file needs: humidities and wind
+# speeds are in tenths, and rain is decoded by collector type. It is kept here, rather than
+# copied from weewx.drivers.vantage, so that decoding does not import the driver, and with it
+# the WeeWX engine.
+archive_map = {
+    'barometer': lambda p, k: float(p[k]) / 1000.0 if p[k] else None,
+    'ET': lambda p, k: float(p[k]) / 1000.0,
+    'extraHumid1': lambda p, k: float(p[k]) if p[k] != 0xff else None,
+    'extraHumid2': lambda p, k: float(p[k]) if p[k] != 0xff else None,
+    'extraTemp1': lambda p, k: float(p[k] - 90) if p[k] != 0xff else None,
+    'extraTemp2': lambda p, k: float(p[k] - 90) if p[k] != 0xff else None,
+    'extraTemp3': lambda p, k: float(p[k] - 90) if p[k] != 0xff else None,
+    'forecastRule': lambda p, k: p[k] if p[k] != 193 else None,
+    'hiRainRate': decode_rain,
+    'highOutTemp': lambda p, k: float(p[k] / 10.0) if p[k] != -32768 else None,
+    'highRadiation': lambda p, k: float(p[k]) if p[k] != 0x7fff else None,
+    'highUV': lambda p, k: float(p[k]) / 10.0 if p[k] != 0xff else None,
+    'inHumidity': lambda p, k: float(p[k]) / 10.0 if p[k] != 0xff else None,
+    'inTemp': lambda p, k: float(p[k]) / 10.0 if p[k] != 0x7fff else None,
+    'leafTemp1': lambda p, k: float(p[k] - 90) if p[k] != 0xff else None,
+    'leafTemp2': lambda p, k: float(p[k] - 90) if p[k] != 0xff else None,
+    'leafWet1': lambda p, k: float(p[k]) if p[k] != 0xff else None,
+    'leafWet2': lambda p, k: float(p[k]) if p[k] != 0xff else None,
+    'leafWet3': lambda p, k: float(p[k]) if p[k] != 0xff else None,
+    'leafWet4': lambda p, k: float(p[k]) if p[k] != 0xff else None,
+    'lowOutTemp': lambda p, k: float(p[k]) / 10.0 if p[k] != 0x7fff else None,
+    'outHumidity': lambda p, k: float(p[k]) / 10.0 if p[k] != 0xff else None,
+    'outTemp': lambda p, k: float(p[k]) / 10.0 if p[k] != 0x7fff else None,
+    'radiation': lambda p, k: float(p[k]) if p[k] != 0x7fff else None,
+    'rain': decode_rain,
+    'soilMoist1': lambda p, k: float(p[k]) if p[k] != 0xff else None,
+    'soilMoist2': lambda p, k: float(p[k]) if p[k] != 0xff else None,
+    'soilMoist3': lambda p, k: float(p[k]) if p[k] != 0xff else None,
+    'soilMoist4': lambda p, k: float(p[k]) if p[k] != 0xff else None,
+    'soilTemp1': lambda p, k: float(p[k] - 90) if p[k] != 0xff else None,
+    'soilTemp2': lambda p, k: float(p[k] - 90) if p[k] != 0xff else None,
+    'soilTemp3': lambda p, k: float(p[k] - 90) if p[k] != 0xff else None,
+    'soilTemp4': lambda p, k: float(p[k] - 90) if p[k] != 0xff else None,
+    'UV': lambda p, k: float(p[k]) / 10.0 if p[k] != 0xff else None,
+    'wind_samples': lambda p, k: float(p[k]) if p[k] else None,
+    'windDir': lambda p, k: float(p[k]) * 22.5 if p[k] != 0xff else None,
+    'windGust': lambda p, k: float(p[k]) / 10.0 if p[k] != 0xff else None,
+    'windGustDir': lambda p, k: float(p[k]) * 22.5 if p[k] != 0xff else None,
+    'windSpeed': lambda p, k: float(p[k]) / 10.0 if p[k] != 0xff else None,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def compile_decoder(vantage_model: int, vantage_iss_id: int) -> Callable[[tuple], dict]:
+    """Return a function that does the work of decode_record() on a record unpacked by
+    weather_data_struct, that is, a tuple in the order of weather_data_names.
+
+    The converter for each field is looked up in archive_map once, here. Fields with no
+    converter, such as packed_time and newSensors1, are dropped now and never looked at again.
+    Decoders are cached, so there is one per (vantage_model, vantage_iss_id).
+    """
+    # The archive_map functions index the raw record by key, so they work as well with a tuple
+    # indexed by position.
+    fields = tuple((index, obs_type, archive_map[obs_type])
+                   for index, obs_type in enumerate(weather_data_names)
+                   if obs_type in archive_map)
+    interval_index = weather_data_names.index('interval')
+    wind_samples_index = weather_data_names.index('wind_samples')
+    us_units = weewx.US
+
+    def decode(data_tuple: tuple) -> dict:
+        interval = int(data_tuple[interval_index])
+        archive_record = {
+            'usUnits': us_units,
+            'interval': interval,
+            'rxCheckPercent': rxcheck(vantage_model, interval, vantage_iss_id,
+                                     data_tuple[wind_samples_index]),
+        }
+        for index, obs_type, func in fields:
+            val = func(data_tuple, index)
+            if val is not None:
+                archive_record[obs_type] = val
+        return archive_record
+
+    return decode
 
 
 # TODO: radiation is not right. Is the 'dash' value 0x8000?
 
-def gen_wlk(path: Path, vantage_model: int = 2, vantage_iss_id: int = 1) -> Iterator[dict]:
-    """Generator function that reads a .WLK file and yields archive records."""
+def parse_header(buffer) -> tuple[int, list[DayIndex]]:
+    """Parse the header block at the start of a buffer holding a .WLK file. Returns the total
+    number of records, and the 32 day indexes."""
+
+    # Unpack the header values.
+    header_values = header_struct.unpack_from(buffer)
+
+    #  Element 0 is the idCode. Check it.
+    if not header_values[0].startswith(b'WDAT5.'):
+        raise ValueError("Not a WeatherLink .WLK file")
+
+    # Element 1 is the total number of records in the file.
+    total_records = header_values[1]
+
+    # Element 2 through 33 are day indexes. There will be 32 of them, but the first one is not
+    # used. The rest represent information about each day of the month (up to 31 of them).
+    day_indexes = []
+    for i in range(32):
+        day_indexes.append(DayIndex(header_values[2 + i], i))
+
+    return total_records, day_indexes
+
+
+class DecodeStats:
+    """Counters for decoding .WLK files. The decoders fill one in if they are given one.
+
+    Times are in seconds, split into the stages of decoding: unpacking the raw records,
+    converting them to physical units, and calculating their timestamps.
+    """
+
+    def __init__(self):
+        self.files = 0
+        # Weather data records decoded
+        self.records = 0
+        # Records that were not decoded, by record type
+        self.skipped = collections.Counter()
+        # Weather data records decoded, but not newer than since_ts
+        self.filtered = 0
+        self.bytes = 0
+        self.unpack = 0.0
+        self.convert = 0.0
+        self.timestamp = 0.0
+
+    @property
+    def seen(self) -> int:
+        """Every record looked at, of any type."""
+        return self.records + self.filtered + sum(self.skipped.values())
+
+    def merge(self, other: 'DecodeStats'):
+        """Add the counters of another DecodeStats to this one."""
+        self.files += other.files
+        self.records += other.records
+        self.skipped.update(other.skipped)
+        self.filtered += other.filtered
+        self.bytes += other.bytes
+        self.unpack += other.unpack
+        self.convert += other.convert
+        self.timestamp += other.timestamp
+
+    def as_dict(self) -> dict:
+        return {'files': self.files, 'records': self.records,
+                'skipped': {str(record_type): count
+                            for record_type, count in sorted(self.skipped.items())},
+                'filtered': self.filtered, 'bytes': self.bytes,
+                'seconds': {'unpack': round(self.unpack, 3), 'convert': round(self.convert, 3),
+                            'timestamp': round(self.timestamp, 3)}}
+
+
+def gen_wlk(path: Path, vantage_model: int = 2, vantage_iss_id: int = 1,
+            since_ts: Optional[int] = None,
+            stats: Optional[DecodeStats] = None) -> Iterator[dict]:
+    """Generator function that reads a .WLK file and yields archive records. If since_ts is
+    given, only records with a timestamp greater than it are yielded. If stats is given, it is
+    updated as the file is decoded."""
+    for _, day_records in gen_wlk_days(path, vantage_model, vantage_iss_id, since_ts, stats):
+        yield from day_records
+
+
+def gen_wlk_days(path: Path, vantage_model: int = 2, vantage_iss_id: int = 1,
+                 since_ts: Optional[int] = None,
+                 stats: Optional[DecodeStats] = None) -> Iterator[tuple[int, list[dict]]]:
+    """Like gen_wlk(), except the records come a whole day at a time, following the day
+    indexes of the file. Yields (day of the month, list of archive records) tuples. Days without
+    records are skipped."""
 
     # Figure out year and month from the filename:
-    year_str, month_str = path.stem.split('-')
-    year, month = int(year_str), int(month_str)
+    year, month = wlk_year_month(path)
+    if since_ts is not None and end_of_month(year, month) <= since_ts:
+        return
+    if path.stat().st_size < header_struct.size:
+        return
+
+    with WLKFile(path, vantage_model, vantage_iss_id) as wlk_file:
+        if stats is not None:
+            stats.files += 1
+            stats.bytes += header_struct.size
+        for day in wlk_file.days():
+            # Skip days that cannot hold any records newer than since_ts
+            if since_ts is not None and end_of_day(year, month, day) <= since_ts:
+                continue
+            day_records = wlk_file.records(day, since_ts, stats)
+            if day_records:
+                yield day, day_records
+
+
+class WLKFile:
+    """Random access to the records of a .WLK file.
+
+    The file is mapped into memory, and its header is parsed once. After that, the records of
+    any day can be decoded on their own, without touching the rest of the file. Use it as a
+    context manager, or call close() when done:
+
+        with WLKFile(Path('2011-06.wlk')) as wlk_file:
+            records = wlk_file[14]
+    """
+
+    def __init__(self, path: Path, vantage_model: int = 2, vantage_iss_id: int = 1):
+        self.path = Path(path)
+        self.year, self.month = wlk_year_month(self.path)
+        self._fd = open(self.path, 'rb')
+        try:
+            self.file_size = os.fstat(self._fd.fileno()).st_size
+            if self.file_size < header_struct.size:
+                raise ValueError(f"{self.path} is too short to be a WeatherLink .WLK file")
+            # Map the whole file once. Records are then unpacked in place.
+            self._buffer = mmap.mmap(self._fd.fileno(), 0, access=mmap.ACCESS_READ)
+            self.total_records, self.day_indexes = parse_header(self._buffer)
+        except Exception:
+            if hasattr(self, '_buffer'):
+                self._buffer.close()
+            self._fd.close()
+            raise
+        self._decode = compile_decoder(vantage_model, vantage_iss_id)
+
+    def days(self) -> list[int]:
+        """Return the days of the month that have records."""
+        return [day for day in range(1, 32) if self.day_indexes[day].records_in_day > 0]
+
+    def records(self, day: int, since_ts: Optional[int] = None,
+                stats: Optional[DecodeStats] = None) -> list[dict]:
+        """Decode the archive records of a day of the month. If since_ts is given, only records
+        newer than it are returned. If stats is given, it is updated."""
+        if not 1 <= day <= 31:
+            raise IndexError(f"No day {day} in a month")
+        day_index = self.day_indexes[day]
+        if day_index.records_in_day <= 0:
+            return []
+        return _decode_day(self._buffer, self.file_size, self.year, self.month, day,
+                           day_index.start_pos, day_index.records_in_day, self._decode,
+                           since_ts, stats)
+
+    def __getitem__(self, day: int) -> list[dict]:
+        return self.records(day)
+
+    def __iter__(self) -> Iterator[dict]:
+        for day in self.days():
+            yield from self.records(day)
+
+    def between(self, start_ts: Optional[int] = None,
+                stop_ts: Optional[int] = None) -> list[dict]:
+        """Return the records with start_ts < dateTime <= stop_ts. Either can be None. Only the
+        days that can hold such records are decoded."""
+        records = []
+        for day in self.days():
+            if start_ts is not None and end_of_day(self.year, self.month, day) <= start_ts:
+                continue
+            if stop_ts is not None and local_midnight(self.year, self.month, day)[0] >= stop_ts:
+                break
+            records.extend(record for record in self.records(day, start_ts)
+                           if stop_ts is None or record['dateTime'] <= stop_ts)
+        return records
+
+    def close(self):
+        self._buffer.close()
+        self._fd.close()
+
+    def __enter__(self) -> 'WLKFile':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _decode_day(buffer, file_size: int, year: int, month: int, day: int, start_pos: int,
+                count: int, decode: Callable[[tuple], dict], since_ts: Optional[int],
+                stats: Optional[DecodeStats] = None) -> list[dict]:
+    """Decode count records of a day, starting with record start_pos of the file. Returns the
+    archive records newer than since_ts. Records past the end of the file are ignored."""
+    # Only time the stages if asked to. The clock is not free.
+    timed = stats is not None
+    perf_counter = time.perf_counter
+    packed_time_index = weather_data_names.index('packed_time')
+
+    # The starting position of the buffer is the number of *records* (not bytes) in. To
+    # find the number of bytes in multiply by the record size, which is 88. We also have
+    # to add in the size of the header.
+    offset = 88 * start_pos + header_struct.size
+    # Find local midnight once for the whole day.
+    midnight, regular = local_midnight(year, month, day)
+    day_records = []
+
+    # Now unpack each record. The count can include the daily summary records.
+    for offset in range(offset, offset + 88 * count, 88):
+        if offset + 88 > file_size:
+            break
+
+        # The first byte identifies the record type
+        record_type = buffer[offset]
+
+        if record_type == 1:
+            if timed:
+                t0 = perf_counter()
+            # Weather data record. Unpack it.
+            data_tuple = weather_data_struct.unpack_from(buffer, offset)
+            if timed:
+                t1 = perf_counter()
+            # Decode and convert to physical units
+            archive_record = decode(data_tuple)
+            if timed:
+                t2 = perf_counter()
+            # Add the time stamp. Days with a DST transition take the slow path.
+            packed_time = data_tuple[packed_time_index]
+            if regular and 0 <= packed_time <= 1440:
+                archive_record['dateTime'] = midnight + 60 * packed_time
+            else:
+                archive_record['dateTime'] = decode_time(year, month, day, packed_time)
+            newer = since_ts is None or archive_record['dateTime'] > since_ts
+            if timed:
+                stats.unpack += t1 - t0
+                stats.convert += t2 - t1
+                stats.timestamp += perf_counter() - t2
+                stats.bytes += 88
+                if newer:
+                    stats.records += 1
+                else:
+                    stats.filtered += 1
+            if newer:
+                day_records.append(archive_record)
+        elif record_type in [2, 3]:
+            # Daily summary record, ignore
+            if timed:
+                stats.skipped[record_type] += 1
+                stats.bytes += 88
+            continue
+        else:
+            # Unknown record type
+            raise ValueError(f"Unknown record type {record_type}")
+
+    return day_records
+
+
+# Daily summary records. Each day of a .WLK file starts with two of them, holding aggregates
+# that WeatherLink calculated from the LOOP data.
+
+# Divisors that convert the fields of the daily summary records to US units. Fields not listed
+# are passed through as integers, except for the direction codes and the packed fields.
+daily_summary_divisors = {
+    **dict.fromkeys(('hiOutTemp', 'lowOutTemp', 'hiInTemp', 'lowInTemp', 'avgOutTemp',
+                     'avgInTemp', 'hiChill', 'lowChill', 'hiDew', 'lowDew', 'avgChill', 'avgDew',
+                     'hiHeat', 'lowHeat', 'avgHeat', 'hiTHSW', 'lowTHSW', 'hiTHW', 'lowTHW',
+                     'hiWetBulb', 'lowWetBulb', 'avgWetBulb', 'integratedHeatDD65',
+                     'integratedCoolDD65'), 10.0),
+    **dict.fromkeys(('hiOutHum', 'lowOutHum', 'hiInHum', 'lowInHum', 'avgOutHum'), 10.0),
+    **dict.fromkeys(('hiBar', 'lowBar', 'avgBar'), 1000.0),
+    **dict.fromkeys(('hiSpeed', 'avgSpeed', 'dailyWindRunTotal', 'hi10MinSpeed'), 10.0),
+    'dailyRainTotal': 1000.0,
+    'hiRainRate': 100.0,
+    'dailyUVDose': 10.0,
+    'hiUV': 10.0,
+    'hiSolar': 1.0,
+    'dailySolarEnergy': 10.0,
+    'dailyETTotal': 1000.0,
+}
+
+# Fields holding a direction code (0-15, 255)
+daily_summary_directions = {'dirHiSpeed', 'hi10MinDir'}
+
+# Fields that count something. A count can reach the largest value of its field, so it has no
+# dash value.
+daily_summary_counts = {'todaysWeather', 'dataSpan', 'numWindPackets', 'minSunlight'}
+
+# Fields that are not decoded directly
+daily_summary_skipped = {'dataType', 'reserved', 'reserved2', 'timeValues', 'dirBins'}
+
+# The fields whose time of day is held in the packed 'timeValues' of each record, in order
+daily_summary1_times = ('hiOutTemp', 'lowOutTemp', 'hiInTemp', 'lowInTemp', 'hiChill',
+                        'lowChill', 'hiDew', 'lowDew', 'hiOutHum', 'lowOutHum', 'hiInHum',
+                        'lowInHum', 'hiBar', 'lowBar', 'hiSpeed', 'hi10MinSpeed', 'hiRainRate',
+                        'hiUV')
+daily_summary2_times = ('hiSolar', 'hiHeat', 'lowHeat', 'hiTHSW', 'lowTHSW', 'hiTHW', 'lowTHW',
+                        'hiWetBulb', 'lowWetBulb')
+
+# Raw values that mean "no data", by struct format
+_daily_summary_dashes = {'h': (-32768, 32767), 'H': (0xffff,), 'B': (0xff,)}
+
+
+def unpack_12bit(buffer: bytes, count: int) -> list[int]:
+    """Unpack count 12-bit values, packed two to every three bytes. The third byte of each
+    group holds the high nibble of both values."""
+    values = []
+    for i in range(count):
+        group = 3 * (i // 2)
+        if i % 2 == 0:
+            values.append(buffer[group] + ((buffer[group + 2] & 0x0F) << 8))
+        else:
+            values.append(buffer[group + 1] + ((buffer[group + 2] & 0xF0) << 4))
+    return values
+
+
+def _decode_daily_summary(data_tuple: tuple, formats: tuple, names: tuple,
+                          time_names: tuple, year: int, month: int, day: int) -> dict:
+    """Decode one unpacked daily summary record into physical units."""
+    daily = {}
+    for fmt, name, raw in zip(formats, names, data_tuple):
+        if name in daily_summary_skipped:
+            continue
+        if name not in daily_summary_counts and raw in _daily_summary_dashes.get(fmt, ()):
+            val = None
+        elif name in daily_summary_directions:
+            val = raw * 22.5
+        elif name in daily_summary_divisors:
+            val = raw / daily_summary_divisors[name]
+        else:
+            val = raw
+        daily[name] = val
+
+    # The time of day each high or low happened, in minutes past midnight.
+    minutes = unpack_12bit(data_tuple[names.index('timeValues')], len(time_names))
+    for name, packed_time in zip(time_names, minutes):
+        daily[name + 'Time'] = decode_time(year, month, day, packed_time) \
+            if 0 <= packed_time <= 1440 and daily.get(name) is not None else None
+    return daily
+
+
+def daily_fieldnames() -> list[str]:
+    """Return every type a record from gen_wlk_daily() can hold. 'dateTime' comes first."""
+    fieldnames = ['dateTime', 'usUnits']
+    for names, time_names in ((daily_summary1_names, daily_summary1_times),
+                              (daily_summary2_names, daily_summary2_times)):
+        fieldnames.extend(name for name in names if name not in daily_summary_skipped)
+        fieldnames.extend(name + 'Time' for name in time_names)
+    fieldnames.extend(f'dirBin{i}' for i in range(16))
+    return fieldnames
+
+
+def daily_integer_types() -> set[str]:
+    """Return the types of daily_fieldnames() that hold integers: the timestamps, the direction
+    bins, and every field that is not scaled, such as dataSpan and numWindPackets."""
+    scaled = set(daily_summary_divisors) | daily_summary_directions
+    return {name for name in daily_fieldnames()
+            if name.endswith('Time') or name.startswith('dirBin') or name not in scaled}
+
+
+def gen_wlk_daily(path: Path) -> Iterator[dict]:
+    """Yield the daily aggregates of a .WLK file, decoded from its daily summary records.
+
+    There is one dict per day, with the fields of both daily summary records in US units.
+    dateTime is the start of the day. Each high and low has a matching '...Time' field with its
+    timestamp. The 16 direction bins are in dirBin0 (north) through dirBin15. Missing values
+    are None.
+    """
+    year, month = wlk_year_month(path)
 
     with open(path, 'rb') as fd:
-        # Read the header block
-        header_data = fd.read(header_struct.size)
-        if len(header_data) < header_struct.size:
+        file_size = os.fstat(fd.fileno()).st_size
+        if file_size < header_struct.size:
             return
+        with mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            _, day_indexes = parse_header(buffer)
+            for day in range(1, 32):
+                day_index = day_indexes[day]
+                if day_index.records_in_day <= 0:
+                    continue
+                daily = {}
+                offset = 88 * day_index.start_pos + header_struct.size
+                # The summary records come first in the day, but don't count on it.
+                for offset in range(offset, offset + 88 * day_index.records_in_day, 88):
+                    if offset + 88 > file_size:
+                        break
+                    record_type = buffer[offset]
+                    if record_type == 2:
+                        data_tuple = daily_summary1_struct.unpack_from(buffer, offset)
+                        daily.update(_decode_daily_summary(
+                            data_tuple, daily_summary1_formats, daily_summary1_names,
+                            daily_summary1_times, year, month, day))
+                    elif record_type == 3:
+                        data_tuple = daily_summary2_struct.unpack_from(buffer, offset)
+                        daily.update(_decode_daily_summary(
+                            data_tuple, daily_summary2_formats, daily_summary2_names,
+                            daily_summary2_times, year, month, day))
+                        bins = unpack_12bit(data_tuple[daily_summary2_names.index('dirBins')], 16)
+                        daily.update((f'dirBin{i}', val) for i, val in enumerate(bins))
+                    if 'dataSpan' in daily and 'numWindPackets' in daily:
+                        break
+                if daily:
+                    yield {'dateTime': local_midnight(year, month, day)[0],
+                           'usUnits': weewx.US,
+                           **daily}
+
+
+# Maps fields of the daily summary records to the WeeWX daily summary that should agree with
+# them, as (type, aggregate).
+day_summary_checks = {
+    'hiOutTemp': ('highOutTemp', 'max'),
+    'lowOutTemp': ('lowOutTemp', 'min'),
+    'hiSpeed': ('windGust', 'max'),
+    'hiSolar': ('highRadiation', 'max'),
+    'hiUV': ('highUV', 'max'),
+    'dailyRainTotal': ('rain', 'sum'),
+    'dailyETTotal': ('ET', 'sum'),
+}
+
+
+def validate_day_summaries(manager, daily_records: Iterable[dict],
+                           tolerance: float = 0.05) -> Iterator[dict]:
+    """Check the daily summaries of a WeeWX database against the aggregates from
+    gen_wlk_daily().
+
+    Yields a dict for each check that fails, with keys 'dateTime', 'field', 'obs_type',
+    'aggregate', 'wlk' (the WLK value) and 'database' (the database value, or None if the
+    database has no summary for the day). Types missing from the database schema are not
+    checked.
+    """
+    import weedb
+    import weewx.units
 
-        # Unpack the header values.
-        header_values = header_struct.unpack(header_data)
+    for daily in daily_records:
+        for field, (obs_type, aggregate) in day_summary_checks.items():
+            if daily.get(field) is None:
+                continue
+            # Express the WLK value in the unit system of the database
+            wlk_value = weewx.units.to_std_system({'usUnits': daily['usUnits'],
+                                                   obs_type: daily[field]},
+                                                  manager.std_unit_system or weewx.US)[obs_type]
+            try:
+                row = manager.getSql(f"SELECT {aggregate} FROM {manager.table_name}_day_{obs_type} "
+                                     f"WHERE dateTime = ?", (daily['dateTime'],))
+            except (weedb.ProgrammingError, weedb.OperationalError):
+                continue
+            db_value = row[0] if row else None
+            if db_value is None or abs(db_value - wlk_value) > tolerance:
+                yield {'dateTime': daily['dateTime'], 'field': field, 'obs_type': obs_type,
+                       'aggregate': aggregate, 'wlk': wlk_value, 'database': db_value}
+
+
+# Columnar engine. It decodes a whole month file at once, using NumPy array operations instead
+# of a function call per field per record.
+
+_numpy_formats = {'B': 'u1', 'h': 'i2', 'H': 'u2', 'I': 'u4', 'i': 'i4'}
+
+
+def make_dtype(record_layout: Iterable[tuple[str, str]]) -> numpy.dtype:
+    """Build a little-endian NumPy structured dtype from a record layout, such as
+    weather_data_record."""
+    return numpy.dtype([(name, '<' + _numpy_formats[fmt]) for fmt, name in record_layout])
+
+
+@functools.lru_cache(maxsize=None)
+def get_weather_data_dtype() -> numpy.dtype:
+    """The dtype of a weather data record. Built on first use, so that NumPy is only loaded by
+    the columnar engine."""
+    return make_dtype(weather_data_record)
+
+
+def _divided(divisor: float, dash: Optional[int] = None):
+    """Vectorized form of float(p[k]) / divisor if p[k] != dash else None"""
+    if dash is None:
+        return lambda c: numpy.ma.masked_array(c / divisor)
+    return lambda c: numpy.ma.masked_array(c / divisor, mask=(c == dash))
+
+
+def _offset(offset: int, dash: int):
+    """Vectorized form of float(p[k] - offset) if p[k] != dash else None"""
+    return lambda c: numpy.ma.masked_array((c - offset).astype(numpy.float64), mask=(c == dash))
+
+
+def _multiplied(factor: float, dash: int):
+    """Vectorized form of float(p[k]) * factor if p[k] != dash else None"""
+    return lambda c: numpy.ma.masked_array(c * factor, mask=(c == dash))
+
+
+def decode_rain_column(c: numpy.ndarray) -> numpy.ma.MaskedArray:
+    """Vectorized form of decode_rain()."""
+    bucket_sizes = numpy.array([numpy.nan if size is None else size
+                                for size in rain_bucket_sizes])
+    collector_types = (c & 0xFFFF) >> 12
+    buckets = bucket_sizes[collector_types]
+    unknown = numpy.isnan(buckets)
+    if unknown.any():
+        raise ValueError(f"Unknown rain collector type: {int(collector_types[unknown][0]) << 12}")
+    return numpy.ma.masked_array((c & 0x0FFF) * buckets)
+
+
+# Vectorized equivalents of the functions in archive_map. Each takes a column of raw values, as
+# int64, and returns a masked array in physical units. Masked elements are missing data.
+columnar_map = {
+    'barometer': _divided(1000.0, 0),
+    'ET': _divided(1000.0),
+    'extraHumid1': _divided(1.0, 0xff),
+    'extraHumid2': _divided(1.0, 0xff),
+    'extraTemp1': _offset(90, 0xff),
+    'extraTemp2': _offset(90, 0xff),
+    'extraTemp3': _offset(90, 0xff),
+    'forecastRule': lambda c: numpy.ma.masked_array(c, mask=(c == 193)),
+    'hiRainRate': decode_rain_column,
+    'highOutTemp': _divided(10.0, -32768),
+    'highRadiation': _divided(1.0, 0x7fff),
+    'highUV': _divided(10.0, 0xff),
+    'inHumidity': _divided(10.0, 0xff),
+    'inTemp': _divided(10.0, 0x7fff),
+    'leafTemp1': _offset(90, 0xff),
+    'leafTemp2': _offset(90, 0xff),
+    'leafWet1': _divided(1.0, 0xff),
+    'leafWet2': _divided(1.0, 0xff),
+    'leafWet3': _divided(1.0, 0xff),
+    'leafWet4': _divided(1.0, 0xff),
+    'lowOutTemp': _divided(10.0, 0x7fff),
+    'outHumidity': _divided(10.0, 0xff),
+    'outTemp': _divided(10.0, 0x7fff),
+    'radiation': _divided(1.0, 0x7fff),
+    'rain': decode_rain_column,
+    'soilMoist1': _divided(1.0, 0xff),
+    'soilMoist2': _divided(1.0, 0xff),
+    'soilMoist3': _divided(1.0, 0xff),
+    'soilMoist4': _divided(1.0, 0xff),
+    'soilTemp1': _offset(90, 0xff),
+    'soilTemp2': _offset(90, 0xff),
+    'soilTemp3': _offset(90, 0xff),
+    'soilTemp4': _offset(90, 0xff),
+    'UV': _divided(10.0, 0xff),
+    'wind_samples': _divided(1.0, 0),
+    'windDir': _multiplied(22.5, 0xff),
+    'windGust': _divided(10.0, 0xff),
+    'windGustDir': _multiplied(22.5, 0xff),
+    'windSpeed': _divided(10.0, 0xff),
+}
+
+
+def _lookup_column(func, c: numpy.ndarray) -> numpy.ma.MaskedArray:
+    """Apply a scalar archive_map function to each distinct value in a column, then broadcast
+    the results. Used for types that have no entry in columnar_map."""
+    uniques, inverse = numpy.unique(c, return_inverse=True)
+    raw_values = uniques.tolist()
+    converted = [func(raw_values, i) for i in range(len(raw_values))]
+    mask = numpy.array([val is None for val in converted], dtype=bool)
+    values = numpy.array([0 if val is None else val for val in converted])
+    return numpy.ma.masked_array(values[inverse], mask=mask[inverse])
+
+
+def _rxcheck_column(interval: numpy.ndarray, wind_samples: numpy.ndarray,
+                    vantage_model: int, vantage_iss_id: int) -> numpy.ma.MaskedArray:
+    """Calculate rxCheckPercent once for each distinct (interval, wind_samples) pair."""
+    keys = (interval << 16) | (wind_samples & 0xFFFF)
+    _, first, inverse = numpy.unique(keys, return_index=True, return_inverse=True)
+    converted = [rxcheck(vantage_model, int(interval[i]), vantage_iss_id, int(wind_samples[i]))
+                 for i in first]
+    mask = numpy.array([val is None for val in converted], dtype=bool)
+    values = numpy.array([0.0 if val is None else val for val in converted], dtype=numpy.float64)
+    return numpy.ma.masked_array(values[inverse], mask=mask[inverse])
+
+
+def decode_wlk_columns(path: Path, vantage_model: int = 2, vantage_iss_id: int = 1,
+                       since_ts: Optional[int] = None,
+                       stats: Optional[DecodeStats] = None) -> dict[str, numpy.ma.MaskedArray]:
+    """Decode all the weather data records in a .WLK file in one pass.
+
+    Returns a dictionary of masked arrays, keyed by observation type, holding the same values
+    that gen_wlk() would yield, in the same order. Masked elements are missing data. If the file
+    holds no weather data records newer than since_ts, the dictionary is empty. If stats is
+    given, it is updated.
+    """
+    columns, _ = _decode_columns(path, vantage_model, vantage_iss_id, since_ts, stats)
+    newer = columns_since(columns, since_ts)
+    _count_newer(stats, columns, newer)
+    return newer
+
+
+def gen_wlk_day_columns(path: Path, vantage_model: int = 2, vantage_iss_id: int = 1,
+                        since_ts: Optional[int] = None, stats: Optional[DecodeStats] = None
+                        ) -> Iterator[tuple[int, dict[str, numpy.ma.MaskedArray]]]:
+    """Like decode_wlk_columns(), except the columns are split into whole days, following the
+    day indexes of the file. Yields (day of the month, columns) tuples. Days without records
+    are skipped."""
+    columns, day_lengths = _decode_columns(path, vantage_model, vantage_iss_id, since_ts, stats)
+    start = 0
+    for day, length in day_lengths:
+        if length == 0:
+            # Only the daily summary records
+            continue
+        day_columns = {obs_type: column[start:start + length]
+                       for obs_type, column in columns.items()}
+        start += length
+        newer = columns_since(day_columns, since_ts)
+        _count_newer(stats, day_columns, newer)
+        if newer and len(newer['dateTime']):
+            yield day, newer
+
+
+def _count_newer(stats: Optional[DecodeStats], columns: dict[str, numpy.ma.MaskedArray],
+                 newer: dict[str, numpy.ma.MaskedArray]):
+    """Count the rows that columns_since() kept as records, and the rest as filtered."""
+    if stats is not None and columns:
+        count = len(newer['dateTime']) if newer else 0
+        stats.records += count
+        stats.filtered += len(columns['dateTime']) - count
+
+
+def _decode_columns(path: Path, vantage_model: int, vantage_iss_id: int,
+                    since_ts: Optional[int], stats: Optional[DecodeStats]
+                    ) -> tuple[dict[str, numpy.ma.MaskedArray], list[tuple[int, int]]]:
+    """Decode the weather data records of the days of a file that can hold records newer than
+    since_ts. The records themselves are not filtered. Returns the columns, and a list of
+    (day of the month, number of rows) tuples giving the days they hold, in order."""
+    if _get_numpy() is None:
+        raise ImportError("The columnar engine requires NumPy")
+
+    year, month = wlk_year_month(path)
+    if since_ts is not None and end_of_month(year, month) <= since_ts:
+        return {}, []
+
+    t0 = time.perf_counter()
+    data = path.read_bytes()
+    if stats is not None:
+        stats.files += 1
+        stats.bytes += len(data)
+    if len(data) < header_struct.size:
+        return {}, []
+    _, day_index_list = parse_header(data)
+
+    # View all complete records as a structured array. Summary records are viewed through the
+    # same dtype, but only their dataType field is looked at.
+    weather_data_dtype = get_weather_data_dtype()
+    n_records = (len(data) - header_struct.size) // weather_data_dtype.itemsize
+    records = numpy.frombuffer(data, dtype=weather_data_dtype, count=n_records,
+                               offset=header_struct.size)
+    data_types = records['dataType']
+
+    # Find the weather data records of each day.
+    indexes = []
+    days = []
+    for day in range(1, 32):
+        day_index = day_index_list[day]
+        if day_index.records_in_day <= 0:
+            continue
+        if since_ts is not None and end_of_day(year, month, day) <= since_ts:
+            continue
+        start = day_index.start_pos
+        stop = min(start + day_index.records_in_day, n_records)
+        day_types = data_types[start:stop]
+        unknown = (day_types < 1) | (day_types > 3)
+        if unknown.any():
+            raise ValueError(f"Unknown record type {day_types[unknown][0]}")
+        day_indexes = numpy.flatnonzero(day_types == 1) + start
+        indexes.append(day_indexes)
+        days.append(day)
+        if stats is not None:
+            for record_type in (2, 3):
+                stats.skipped[record_type] += int(numpy.count_nonzero(day_types == record_type))
+
+    if not indexes:
+        return {}, []
+    selected = records[numpy.concatenate(indexes)]
+    if not len(selected):
+        return {}, []
+    raw = {name: selected[name].astype(numpy.int64) for name in weather_data_names}
+    t1 = time.perf_counter()
+
+    columns = {
+        'usUnits': numpy.ma.masked_array(numpy.full(len(selected), weewx.US)),
+        'interval': numpy.ma.masked_array(raw['interval']),
+        'rxCheckPercent': _rxcheck_column(raw['interval'], raw['wind_samples'],
+                                          vantage_model, vantage_iss_id),
+    }
+    for obs_type in weather_data_names:
+        if obs_type not in archive_map:
+            continue
+        if obs_type in columnar_map:
+            columns[obs_type] = columnar_map[obs_type](raw[obs_type])
+        else:
+            columns[obs_type] = _lookup_column(archive_map[obs_type], raw[obs_type])
+
+    t2 = time.perf_counter()
+
+    # Convert the packed times one day at a time.
+    day_packed_times = numpy.split(raw['packed_time'], numpy.cumsum([len(i) for i in indexes])[:-1])
+    columns['dateTime'] = numpy.ma.masked_array(
+        numpy.concatenate([decode_time_column(year, month, day, packed_times)
+                           for day, packed_times in zip(days, day_packed_times)]))
+
+    if stats is not None:
+        stats.unpack += t1 - t0
+        stats.convert += t2 - t1
+        stats.timestamp += time.perf_counter() - t2
+    return columns, [(day, len(day_indexes)) for day, day_indexes in zip(days, indexes)]
+
+
+def columns_since(columns: dict[str, numpy.ma.MaskedArray],
+                  since_ts: Optional[int]) -> dict[str, numpy.ma.MaskedArray]:
+    """Keep only the rows of some decoded columns with a timestamp greater than since_ts."""
+    if since_ts is None or not columns:
+        return columns
+    newer = columns['dateTime'].data > since_ts
+    if newer.all():
+        return columns
+    if not newer.any():
+        return {}
+    return {obs_type: column[newer] for obs_type, column in columns.items()}
+
+
+def decode_time_column(year: int, month: int, day: int,
+                       packed_times: numpy.ndarray) -> numpy.ndarray:
+    """Vectorized form of decode_time(), for all the packed times of one day."""
+    invalid = (packed_times < 0) | (packed_times > 1440)
+    if invalid.any():
+        raise ValueError(f"Invalid packed time: {packed_times[invalid][0]}")
+    midnight, regular = local_midnight(year, month, day)
+    if regular:
+        return midnight + 60 * packed_times.astype(numpy.int64)
+    return numpy.array([decode_time(year, month, day, packed_time)
+                        for packed_time in packed_times.tolist()], dtype=numpy.int64)
+
+
+def gen_wlk_columnar(path: Path, vantage_model: int = 2, vantage_iss_id: int = 1,
+                     since_ts: Optional[int] = None,
+                     stats: Optional[DecodeStats] = None) -> Iterator[dict]:
+    """Like gen_wlk(), except the file is decoded with the columnar engine."""
+    yield from gen_column_records(decode_wlk_columns(path, vantage_model, vantage_iss_id,
+                                                     since_ts, stats))
+
+
+def gen_column_records(columns: dict[str, numpy.ma.MaskedArray]) -> Iterator[dict]:
+    """Yield the rows of some decoded columns as archive records."""
+    names = list(columns)
+    # Masked elements become None, which are then skipped.
+    values = [column.tolist() for column in columns.values()]
+    for row in zip(*values):
+        yield {name: val for name, val in zip(names, row) if val is not None}
+
+
+class DecodeCache:
+    """An on-disk cache of decoded .WLK files.
+
+    Each file is decoded by the columnar engine, and the result is saved as a compressed NumPy
+    .npz file. Entries are keyed by a hash of the file contents, plus vantage_model and
+    vantage_iss_id, so edited files are decoded again. When the cache grows beyond max_bytes,
+    the least recently used entries are removed.
+    """
 
-        #  Element 0 is the idCode. Check it.
-        if not header_values[0].startswith(b'WDAT5.'):
-            raise ValueError("Not a WeatherLink .WLK file")
+    # Change this when a change to the decoders changes their output.
+    VERSION = 1
+
+    def __init__(self, cache_dir: str, max_bytes: int = 1024 * 1024 * 1024):
+        if _get_numpy() is None:
+            raise ImportError("The decode cache requires NumPy")
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, path: Path, vantage_model: int, vantage_iss_id: int) -> str:
+        """Return the cache key of a file and station configuration."""
+        digest = hashlib.sha256(path.read_bytes())
+        digest.update(f'{self.VERSION}:{vantage_model}:{vantage_iss_id}'.encode())
+        return digest.hexdigest()
+
+    def decode(self, path: Path, vantage_model: int = 2, vantage_iss_id: int = 1,
+               stats: Optional[DecodeStats] = None) -> dict[str, numpy.ma.MaskedArray]:
+        """Return the decoded columns of a file, from the cache if possible. If stats is given,
+        a file that is decoded is counted in it. For a cached file, only the time to load it is
+        counted, as unpacking."""
+        # A worker process may not have loaded NumPy yet.
+        _get_numpy()
+        entry_path = os.path.join(self.cache_dir,
+                                  self.key(path, vantage_model, vantage_iss_id) + '.npz')
+        t0 = time.perf_counter()
+        try:
+            columns = self._load(entry_path)
+        except FileNotFoundError:
+            columns = None
+        except (zipfile.BadZipFile, ValueError, EOFError, KeyError, OSError) as e:
+            # A truncated or corrupt entry, left by a full disk or a killed run. Drop it, and
+            # decode the file again.
+            log.warning("Removing corrupt cache entry %s: %s", entry_path, e)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(entry_path)
+            columns = None
+        if columns is None:
+            columns = decode_wlk_columns(path, vantage_model, vantage_iss_id, stats=stats)
+            self._save(entry_path, columns)
+            self._evict()
+        else:
+            # Mark the entry as recently used.
+            os.utime(entry_path)
+            if stats is not None:
+                stats.files += 1
+                stats.bytes += path.stat().st_size
+                stats.unpack += time.perf_counter() - t0
+                stats.records += len(columns['dateTime']) if columns else 0
+        return columns
+
+    def gen_records(self, path: Path, vantage_model: int = 2, vantage_iss_id: int = 1,
+                    since_ts: Optional[int] = None,
+                    stats: Optional[DecodeStats] = None) -> Iterator[dict]:
+        """Like gen_wlk(), except the decoded file comes from the cache if possible."""
+        columns = self.decode(path, vantage_model, vantage_iss_id, stats)
+        newer = columns_since(columns, since_ts)
+        if stats is not None and columns:
+            # The whole file was counted. Move the records that are too old.
+            count = len(newer['dateTime']) if newer else 0
+            stats.filtered += len(columns['dateTime']) - count
+            stats.records -= len(columns['dateTime']) - count
+        yield from gen_column_records(newer)
+
+    @staticmethod
+    def _load(entry_path: str) -> dict[str, numpy.ma.MaskedArray]:
+        with numpy.load(entry_path) as npz:
+            return {name: numpy.ma.masked_array(npz[name],
+                                                mask=npz[name + '__mask']
+                                                if name + '__mask' in npz.files
+                                                else numpy.ma.nomask)
+                    for name in npz.files if not name.endswith('__mask')}
+
+    @staticmethod
+    def _save(entry_path: str, columns: dict[str, numpy.ma.MaskedArray]):
+        arrays = {}
+        for name, column in columns.items():
+            arrays[name] = column.data
+            if numpy.ma.is_masked(column):
+                arrays[name + '__mask'] = numpy.ma.getmaskarray(column)
+        # Write to a temporary file first, so readers never see a partial entry.
+        tmp_path = f'{entry_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as fd:
+            numpy.savez_compressed(fd, **arrays)
+        os.replace(tmp_path, entry_path)
+
+    def _evict(self):
+        """Remove the least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.npz'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                # Another process got there first
+                pass
+            total -= size
+
+
+def select_engine(engine: str = 'auto') -> Callable[..., Iterator[dict]]:
+    """Return the generator function for a decode engine. Choices are 'numpy' (the columnar
+    engine), 'python' (gen_wlk), or 'auto', which uses NumPy if it is installed."""
+    engine = engine.lower()
+    if engine == 'auto':
+        engine = 'numpy' if _get_numpy() is not None else 'python'
+    if engine == 'numpy':
+        if _get_numpy() is None:
+            raise ImportError("The 'numpy' engine requires NumPy")
+        return gen_wlk_columnar
+    elif engine == 'python':
+        return gen_wlk
+    raise ValueError(f"Unknown engine: {engine}")
+
+
+class ImportProgress:
+    """Tracks the progress of an import, file by file, and reports it to the log.
+
+    The number of records to expect comes from the day indexes of the files, taken from a
+    catalog if there is one, otherwise read from their headers. While records are being
+    yielded, a progress line, with an estimate of the time remaining, is logged every interval
+    seconds. The counters are available from summary() at any time.
+    """
 
-        # Element 1 is the total number of records in the file.
-        # We don't use it, but it might be useful later.
-        total_records = header_values[1]
+    def __init__(self, plan: list[tuple[Path, list[int]]],
+                 catalog: Optional[dict[str, dict]] = None, interval: float = 60.0):
+        self.interval = interval
+        self.expected = 0
+        for path, days in plan:
+            entry = catalog.get(str(path.resolve())) if catalog else None
+            if entry is None:
+                entry = read_catalog_entry(path)
+            self.expected += sum(entry['days'][str(day)][0] for day in days
+                                 if str(day) in entry['days'])
+        self.total = DecodeStats()
+        # The counters of each finished file, keyed by its path
+        self.files = {}
+        # The counters of the file being read, if it is being decoded in this process
+        self.current = None
+        self.start_time = time.time()
+        self.last_log = self.start_time
+
+    def track(self, path: Path, records: Iterable[dict],
+              stats: DecodeStats) -> Iterator[dict]:
+        """Yield the records of a file, logging progress along the way. The counters of the
+        file are in stats, which is added to the totals when the file is done."""
+        self.current = stats
+        for count, record in enumerate(records, 1):
+            yield record
+            # Checking the clock for every record would slow things down.
+            if not count % 1024 and time.time() - self.last_log >= self.interval:
+                self.log_progress()
+        self.current = None
+        self.files[str(path)] = stats
+        self.total.merge(stats)
+
+    def seen(self) -> int:
+        """How many records have been looked at so far."""
+        return self.total.seen + (self.current.seen if self.current else 0)
+
+    def remaining(self) -> Optional[float]:
+        """Estimate the seconds left, from the rate so far. None if it cannot be estimated."""
+        seen = self.seen()
+        if not seen:
+            return None
+        return (time.time() - self.start_time) * max(self.expected - seen, 0) / seen
+
+    def log_progress(self):
+        self.last_log = time.time()
+        seen = self.seen()
+        records = self.total.records + (self.current.records if self.current else 0)
+        remaining = self.remaining()
+        percent = 100.0 * seen / self.expected if self.expected else 100.0
+        log.info("Imported %d records from %d files; %d of %d records read (%.1f%%); "
+                 "about %s remaining", records, len(self.files), seen, self.expected, percent,
+                 f"{remaining:.0f}s" if remaining is not None else "unknown time")
+
+    def summary(self) -> dict:
+        """Return the counters of the import, overall and for each file."""
+        return {'elapsed': round(time.time() - self.start_time, 3),
+                'expected': self.expected,
+                'total': self.total.as_dict(),
+                'files': {path: stats.as_dict() for path, stats in self.files.items()}}
+
+    def log_summary(self):
+        summary = self.summary()
+        log.info("Import finished in %.1fs: %s", summary['elapsed'],
+                 json.dumps(summary['total']))
+        for path, file_summary in summary['files'].items():
+            log.debug("%s: %s", path, json.dumps(file_summary))
+
+
+def _decode_file(gen_records: Callable[..., Iterator[dict]], path: Path, vantage_model: int,
+                 vantage_iss_id: int, since_ts: Optional[int],
+                 stats: Optional[DecodeStats] = None) -> tuple[list[dict], Optional[DecodeStats]]:
+    """Decode a whole file. This runs in a worker process, so the counters in stats, if
+    given, are returned with the records."""
+    if stats is None:
+        return list(gen_records(path, vantage_model, vantage_iss_id, since_ts)), None
+    return list(gen_records(path, vantage_model, vantage_iss_id, since_ts, stats)), stats
+
+
+def gen_files(paths: Iterable[Path], gen_records: Callable[..., Iterator[dict]],
+              vantage_model: int = 2, vantage_iss_id: int = 1,
+              since_ts: Optional[int] = None, jobs: int = 1,
+              stop_ts: Optional[int] = None,
+              progress: Optional[ImportProgress] = None,
+              executor=None) -> Iterator[dict]:
+    """Yield the archive records of a sequence of .WLK files, in the order of the files.
+
+    Files that hold nothing newer than since_ts are skipped without opening them. If stop_ts is
+    given, the records end with the last one at or before it. If jobs is greater than 1, files
+    are decoded in a pool of that many worker processes. At most two files per worker are
+    decoded ahead of the file being yielded, which bounds memory use. To share one pool between
+    several calls, pass it as executor; it is not shut down afterwards. If progress is given,
+    the decoding of each file is counted and timed in it.
+    """
+    records = _gen_ordered(paths, gen_records, vantage_model, vantage_iss_id, since_ts, jobs,
+                           progress, executor)
+    if stop_ts is not None:
+        records = itertools.takewhile(lambda record: record['dateTime'] <= stop_ts, records)
+    return records
+
+
+def _gen_ordered(paths: Iterable[Path], gen_records: Callable[..., Iterator[dict]],
+                 vantage_model: int, vantage_iss_id: int,
+                 since_ts: Optional[int], jobs: int,
+                 progress: Optional[ImportProgress] = None,
+                 executor=None) -> Iterator[dict]:
+    """Yield the records of some files in order, decoding them in worker processes if jobs
+    is greater than 1, or if a pool is given as executor."""
+    if since_ts is not None:
+        paths = [path for path in paths if end_of_month(*wlk_year_month(path)) > since_ts]
+
+    if jobs <= 1 and executor is None:
+        for path in paths:
+            if progress is None:
+                yield from gen_records(path, vantage_model, vantage_iss_id, since_ts)
+            else:
+                stats = DecodeStats()
+                yield from progress.track(
+                    path, gen_records(path, vantage_model, vantage_iss_id, since_ts, stats),
+                    stats)
+        return
 
-        # Element 2 through 33 are day indexes. There will be 32 of them, but the first one is not
-        # used. The rest represent information about each day of the month (up to 31 of them).
-        day_indexes = []
-        for i in range(32):
-            day_indexes.append(DayIndex(header_values[2 + i], i))
+    if executor is None:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            yield from _gen_pooled(paths, gen_records, vantage_model, vantage_iss_id,
+                                   since_ts, jobs, progress, executor)
+    else:
+        yield from _gen_pooled(paths, gen_records, vantage_model, vantage_iss_id,
+                               since_ts, jobs, progress, executor)
+
+
+def _gen_pooled(paths: Iterable[Path], gen_records: Callable[..., Iterator[dict]],
+                vantage_model: int, vantage_iss_id: int, since_ts: Optional[int], jobs: int,
+                progress: Optional[ImportProgress], executor) -> Iterator[dict]:
+    """Yield the records of some files in order, decoding them in a pool of processes."""
+    path_iter = iter(paths)
+    pending = collections.deque()
+
+    def submit(path: Path):
+        stats = DecodeStats() if progress is not None else None
+        future = executor.submit(_decode_file, gen_records, path, vantage_model,
+                                 vantage_iss_id, since_ts, stats)
+        pending.append((path, future))
+
+    try:
+        for path in path_iter:
+            submit(path)
+            if len(pending) >= 2 * max(jobs, 1):
+                break
+        # Results are collected in submission order, so records come out in file order.
+        while pending:
+            path, future = pending.popleft()
+            records, stats = future.result()
+            for next_path in path_iter:
+                submit(next_path)
+                break
+            if progress is None:
+                yield from records
+            else:
+                yield from progress.track(path, records, stats)
+    finally:
+        # If the consumer stopped early, don't wait for files nobody will use.
+        for _, future in pending:
+            future.cancel()
 
-        # Now march through each day of the month.
-        for day in range(1, 31):
-            assert day_indexes[day].day_in_month == day
-            if day_indexes[day].records_in_day == 0:
-                continue
 
-            # The starting position of the buffer is the number of *records* (not bytes) in. To
-            # find the number of bytes in multiply by the record size, which is 88. We also have
-            # to add in the size of the header.
-            fd.seek(88 * day_indexes[day].start_pos + header_struct.size)
+def gen_prefetched(records: Iterable[dict], chunks: int = 4,
+                   chunk_size: int = 1024) -> Iterator[dict]:
+    """Yield the same records, but produce them in a background thread, so reading and
+    decoding the next ones overlaps with whatever the consumer does with the current ones.
 
-            # Now read each record in the day. Stop when we reach the number of records in the day.
-            n = 0
-            while n < day_indexes[day].records_in_day:
-                record_buffer = fd.read(88)
-                if len(record_buffer) < 88:
-                    break
+    Records are passed over in lists of chunk_size. At most chunks lists wait in the queue;
+    when it is full, the thread waits, which bounds memory use. An exception in the thread is
+    raised again in the consumer. If the consumer stops early, the thread stops too.
+    """
+    import queue
+    import threading
+
+    buffer = queue.Queue(maxsize=chunks)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        # Wait for room in the queue, unless the consumer has gone away.
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for chunk in _gen_batches(records, chunk_size):
+                if not put(chunk):
+                    return
+        except BaseException as e:
+            put(e)
+        else:
+            put(None)
+        finally:
+            # Let the source clean up in this thread, e.g., shut down its worker processes.
+            if hasattr(records, 'close'):
+                records.close()
+
+    thread = threading.Thread(target=produce, name='wlk-prefetch', daemon=True)
+    thread.start()
+    try:
+        while True:
+            chunk = buffer.get()
+            if chunk is None:
+                break
+            if isinstance(chunk, BaseException):
+                raise chunk
+            yield from chunk
+    finally:
+        stop.set()
+        thread.join()
+
+
+class WLKWatcher:
+    """Follows a set of .WLK files as WeatherLink adds records to them.
+
+    For each file it remembers the size and modification time, and how many records each day
+    held. On each poll, only files that changed are opened, only their header is parsed, and
+    only the records added to each day since the last poll are decoded. The file patterns are
+    searched again on each poll, so a new month's file is picked up when it appears.
+    """
 
-                # The first byte identifies the record type
-                record_type = record_buffer[0]
-
-                if record_type == 1:
-                    # Weather data record. Unpack the buffer.
-                    data_tuple = weather_data_struct.unpack(record_buffer)
-                    raw_value_dict = dict(zip(weather_data_names, data_tuple))
-                    # Decode and convert to physical units
-                    archive_record = decode_record(raw_value_dict, vantage_model, vantage_iss_id)
-                    # Add the time stamp
-                    archive_record['dateTime'] = decode_time(year, month, day,
-                                                             raw_value_dict['packed_time'])
-                    yield archive_record
-                    n += 1
-                elif record_type in [2, 3]:
-                    # Daily summary record, ignore
-                    continue
-                else:
-                    # Unknown record type
-                    raise ValueError(f"Unknown record type {record_type}")
+    def __init__(self, wlk_files: Iterable[str], vantage_model: int = 2,
+                 vantage_iss_id: int = 1, since_ts: Optional[int] = None):
+        self.patterns = list(wlk_files)
+        self.vantage_model = vantage_model
+        self.vantage_iss_id = vantage_iss_id
+        # The timestamp of the newest record returned so far
+        self.last_ts = since_ts
+        # For each file, (size, mtime, {day: (start_pos, records read)})
+        self.files = {}
+
+    def poll(self, since_ts: Optional[int] = None) -> list[dict]:
+        """Return the records added to the files since the last poll that are newer than both
+        since_ts and the newest record returned before. They are in the order of the files."""
+        if since_ts is not None:
+            self.last_ts = since_ts if self.last_ts is None else max(self.last_ts, since_ts)
+        records = []
+        for path in find_files(self.patterns):
+            stat = path.stat()
+            known = self.files.get(path)
+            if known is not None and known[:2] == (stat.st_size, stat.st_mtime):
+                continue
+            if known is None and self.last_ts is not None \
+                    and end_of_month(*wlk_year_month(path)) <= self.last_ts:
+                # An old file. Remember it, without reading it.
+                self.files[path] = (stat.st_size, stat.st_mtime, {})
+                continue
+            records.extend(self._read_new(path, stat, known[2] if known else {}))
+        if records:
+            self.last_ts = max(record['dateTime'] for record in records)
+        return records
+
+    def _read_new(self, path: Path, stat: os.stat_result,
+                  days_read: dict[int, tuple[int, int]]) -> list[dict]:
+        """Decode the records of a file that were not read before."""
+        year, month = wlk_year_month(path)
+        decode = compile_decoder(self.vantage_model, self.vantage_iss_id)
+        records = []
+        days = {}
+        with open(path, 'rb') as fd:
+            file_size = os.fstat(fd.fileno()).st_size
+            if file_size < header_struct.size:
+                return records
+            with mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                _, day_indexes = parse_header(buffer)
+                for day in range(1, 32):
+                    start_pos, records_in_day = (day_indexes[day].start_pos,
+                                                 day_indexes[day].records_in_day)
+                    if records_in_day <= 0:
+                        continue
+                    # Only the records that are in the file yet. The header can be ahead.
+                    available = max(min(records_in_day,
+                                        (file_size - header_struct.size) // 88 - start_pos), 0)
+                    days[day] = (start_pos, available)
+                    first = 0
+                    if day in days_read and days_read[day][0] == start_pos:
+                        first = days_read[day][1]
+                    if first >= available or (self.last_ts is not None
+                                              and end_of_day(year, month, day) <= self.last_ts):
+                        continue
+                    records.extend(_decode_day(buffer, file_size, year, month, day,
+                                               start_pos + first, available - first, decode,
+                                               self.last_ts))
+        self.files[path] = (stat.st_size, stat.st_mtime, days)
+        return records
 
 
 class WLKDriver(weewx.drivers.AbstractDevice):
-    def __init__(self, wlk_config: dict):
-        # Get the list of WLK files to use
-        wlk_files = weeutil.weeutil.option_as_list(wlk_config.get('wlk_files', []))
-        # Expand any environment variables and the '~' symbol
-        self.wlk_files = find_files(wlk_files)
-        self.vantage_model = to_int(wlk_config.get('vantage_model', 2))
-        self.vantage_iss_id = to_int(wlk_config.get('vantage_iss_id', 1))
+    def __init__(self, wlk_config: dict, binding: str = 'wx_binding'):
+        import weeutil.weeutil
+        to_int = weeutil.weeutil.to_int
+        # The engine saves records in a single database, so only the group of files bound to
+        # it is imported. A group without a binding is bound to it, unless another group names
+        # it. Other groups are loaded with the --to-database --groups option of the converter.
+        all_groups = read_groups(wlk_config)
+        groups = [group for group in all_groups if group.binding == binding] \
+            or [group for group in all_groups if group.binding is None]
+        if len(groups) != 1:
+            raise ValueError(f"Exactly one group of WLK files must be bound to {binding}. "
+                             f"Found {len(groups)}.")
+        group = groups[0]
+        self.wlk_files = group.wlk_files
+        self.vantage_model = group.vantage_model
+        self.vantage_iss_id = group.vantage_iss_id
+        # Which decode engine to use: 'auto', 'numpy', or 'python'
+        self.gen_records = select_engine(wlk_config.get('engine', 'auto'))
+        # Optional cache of decoded files
+        if 'cache_dir' in wlk_config:
+            if wlk_config.get('engine', 'auto').lower() == 'python':
+                raise ValueError("Option cache_dir decodes with the numpy engine. "
+                                 "It cannot be used with engine = python.")
+            cache = DecodeCache(wlk_config['cache_dir'],
+                                to_int(wlk_config.get('cache_size', 1024)) * 1024 * 1024)
+            self.gen_records = cache.gen_records
+        # How many worker processes to decode files with. 1 means no worker processes.
+        self.jobs = to_int(wlk_config.get('jobs', 1))
+        # Optional limits on the dates to import, as YYYY-MM-DD. Both are inclusive.
+        self.start_ts, self.stop_ts = date_range(wlk_config.get('start'), wlk_config.get('end'))
+        # An optional catalog of the files, used to plan which files and days to read
+        catalog_path = wlk_config.get('catalog')
+        self.catalog = build_catalog(self.wlk_files, os.path.expanduser(catalog_path)) \
+            if catalog_path else None
+        # Optionally, check the structure of every file before importing anything.
+        if weeutil.weeutil.to_bool(wlk_config.get('validate', False)):
+            problems = [problem for _, file_problems in scan_files(self.wlk_files, self.jobs)
+                        for problem in file_problems]
+            for problem in problems:
+                log.error("%s, day %s: %s", problem['path'], problem['day'] or '-',
+                          problem['problem'])
+            if problems:
+                raise ValueError(f"Found {len(problems)} problems in the WLK files. "
+                                 f"See the log for details.")
+        # If set, how often to log the progress of the import, in seconds. The counters of the
+        # last import are then in self.progress.
+        progress_interval = wlk_config.get('progress_interval')
+        self.progress_interval = float(progress_interval) if progress_interval else None
+        self.progress = None
+        # How many chunks of records to read ahead in a background thread. 0 means none.
+        self.prefetch = to_int(wlk_config.get('prefetch', 0))
+        # Whether to keep following the files after the import, and how often to look at them
+        self.watcher = WLKWatcher(group.patterns, self.vantage_model, self.vantage_iss_id) \
+            if weeutil.weeutil.to_bool(wlk_config.get('watch', False)) else None
+        self.poll_interval = float(wlk_config.get('poll_interval', 60))
+        self.caught_up = False
 
     def genLoopPackets(self):
-        raise NotImplementedError("WLK import complete. Ignore this exception.")
+        if self.watcher is None:
+            raise NotImplementedError("WLK import complete. Ignore this exception.")
+        # Following the files. New records come from genArchiveRecords(), which the engine
+        # calls at the end of each archive interval when record_generation is 'hardware'.
+        # Meanwhile, send a heartbeat so the engine's loop keeps turning.
+        while True:
+            time.sleep(self.poll_interval)
+            yield {'dateTime': int(time.time()), 'usUnits': weewx.US}
 
     def genArchiveRecords(self, since_ts):
-        for path in self.wlk_files:
-            yield from gen_wlk(path, self.vantage_model, self.vantage_iss_id)
+        if self.caught_up:
+            # Only the records WeatherLink has added since the last call.
+            for record in self.watcher.poll(since_ts):
+                if self.stop_ts is not None and record['dateTime'] > self.stop_ts:
+                    break
+                yield record
+            return
+        if self.start_ts is not None:
+            since_ts = self.start_ts if since_ts is None else max(since_ts, self.start_ts)
+        plan = plan_range(self.wlk_files, since_ts, self.stop_ts, self.catalog)
+        if self.progress_interval:
+            self.progress = ImportProgress(plan, self.catalog, self.progress_interval)
+        records = gen_files([path for path, _ in plan], self.gen_records, self.vantage_model,
+                            self.vantage_iss_id, since_ts, self.jobs, self.stop_ts,
+                            self.progress)
+        if self.prefetch > 0:
+            records = gen_prefetched(records, self.prefetch)
+        for record in records:
+            since_ts = record['dateTime']
+            yield record
+        if self.progress is not None:
+            self.progress.log_summary()
+        if self.watcher is not None:
+            # From now on, follow the files from the last record imported.
+            self.watcher.last_ts = since_ts
+            self.caught_up = True
 
     @property
     def hardware_name(self):
         return "WLK pseudo-device"
 
 
+class FileGroup:
+    """A group of .WLK files from one station, with the parameters to decode them, and the data
+    binding of the database they belong in. A binding of None means the default database."""
+
+    def __init__(self, name: str, wlk_files: list[Path], vantage_model: int = 2,
+                 vantage_iss_id: int = 1, binding: Optional[str] = None,
+                 patterns: Optional[list[str]] = None):
+        self.name = name
+        self.wlk_files = wlk_files
+        # The paths and wildcards the files were found with
+        self.patterns = patterns if patterns is not None else [str(p) for p in wlk_files]
+        self.vantage_model = vantage_model
+        self.vantage_iss_id = vantage_iss_id
+        self.binding = binding
+
+    def __str__(self):
+        return (f"{self.name}: {len(self.wlk_files)} files, model {self.vantage_model}, "
+                f"ISS ID {self.vantage_iss_id}, binding {self.binding or 'default'}")
+
+
+def read_groups(wlk_config: dict) -> list[FileGroup]:
+    """Read the groups of files given in a [WLK] stanza.
+
+    Each subsection of [WLK] is a group, with its own wlk_files, vantage_model, vantage_iss_id,
+    and binding. Options missing from a subsection are taken from [WLK]. If there are no
+    subsections, [WLK] itself is the only group.
+    """
+    names = [name for name, value in wlk_config.items() if isinstance(value, dict)]
+    if not names:
+        return [_read_group('WLK', wlk_config, {})]
+    return [_read_group(name, wlk_config[name], wlk_config) for name in names]
+
+
+def _read_group(name: str, options: dict, defaults: dict) -> FileGroup:
+    import weeutil.weeutil
+    to_int = weeutil.weeutil.to_int
+
+    def get(key, default=None):
+        return options.get(key, defaults.get(key, default))
+
+    patterns = weeutil.weeutil.option_as_list(get('wlk_files', []))
+    # Expand any environment variables and the '~' symbol
+    wlk_files = find_files(patterns)
+    return FileGroup(name, wlk_files, to_int(get('vantage_model', 2)),
+                     to_int(get('vantage_iss_id', 1)), get('binding'), patterns)
+
+
 def find_files(inputs: Iterable[str]) -> list[Path]:
     """
     Find and return a list of files from the given input paths. This function processes the
@@ -478,27 +1919,822 @@ def find_files(inputs: Iterable[str]) -> list[Path]:
     return sorted(list(seen))
 
 
-def main():
+# A catalog describes what each .WLK file covers, using only its header. It is a dictionary,
+# keyed by the path of each file, of entries that look like:
+#   {'year': 2018, 'month': 6, 'size': 1234567, 'mtime': 1530403200.0, 'total_records': 8700,
+#    'days': {'1': [290, 0], '2': [290, 290], ...}}
+# where 'days' maps each day that holds records to [records_in_day, start_pos].
+
+CATALOG_VERSION = 1
+
+
+def read_catalog_entry(path: Path) -> dict:
+    """Summarize a .WLK file, reading only its header block."""
+    year, month = wlk_year_month(path)
+    stat = path.stat()
+    entry = {'year': year, 'month': month, 'size': stat.st_size, 'mtime': stat.st_mtime,
+             'total_records': 0, 'days': {}}
+    with open(path, 'rb') as fd:
+        header_data = fd.read(header_struct.size)
+    if len(header_data) == header_struct.size:
+        entry['total_records'], day_indexes = parse_header(header_data)
+        entry['days'] = {str(day): [day_indexes[day].records_in_day, day_indexes[day].start_pos]
+                         for day in range(1, 32) if day_indexes[day].records_in_day > 0}
+    return entry
+
+
+def build_catalog(paths: Iterable[Path], catalog_path: Optional[str] = None) -> dict[str, dict]:
+    """Return a catalog of some .WLK files.
+
+    If catalog_path is given, and the file exists, the entries in it are reused for files whose
+    size and modification time have not changed. Only the other files have their headers read.
+    Their entries are added to the saved catalog, which is then written back to catalog_path.
+    Entries for files that are not in paths are kept, so the returned catalog can hold more
+    files than were asked for.
+    """
+    saved = {}
+    if catalog_path and os.path.exists(catalog_path):
+        with open(catalog_path) as fd:
+            contents = json.load(fd)
+        if contents.get('version') == CATALOG_VERSION:
+            saved = contents['files']
+
+    catalog = dict(saved)
+    changed = False
+    for path in paths:
+        key = str(path.resolve())
+        stat = path.stat()
+        entry = saved.get(key)
+        if entry is None or entry['size'] != stat.st_size or entry['mtime'] != stat.st_mtime:
+            catalog[key] = read_catalog_entry(path)
+            changed = True
+
+    if catalog_path and changed:
+        # Write to a temporary file first, so an interrupted save cannot corrupt the catalog.
+        tmp_path = f'{catalog_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as fd:
+            json.dump({'version': CATALOG_VERSION, 'files': catalog}, fd)
+        os.replace(tmp_path, catalog_path)
+    return catalog
+
+
+def plan_range(paths: Iterable[Path], start_ts: Optional[int] = None,
+               stop_ts: Optional[int] = None,
+               catalog: Optional[dict[str, dict]] = None) -> list[tuple[Path, list[int]]]:
+    """Work out which files, and which days in them, can hold records with timestamps in the
+    range start_ts < dateTime <= stop_ts. Either end can be None.
+
+    With a catalog, only days that hold records are included. Without one, every day of each
+    month in the range is assumed to. Returns a list of (path, days) tuples.
+    """
+    plan = []
+    for path in paths:
+        entry = catalog.get(str(path.resolve())) if catalog else None
+        if entry:
+            year, month = entry['year'], entry['month']
+            candidates = sorted(int(day) for day in entry['days'])
+        else:
+            year, month = wlk_year_month(path)
+            candidates = range(1, calendar.monthrange(year, month)[1] + 1)
+        # The records of a day have timestamps after the midnight that starts it, up to and
+        # including the midnight that ends it.
+        days = [day for day in candidates
+                if (start_ts is None or end_of_day(year, month, day) > start_ts)
+                and (stop_ts is None or local_midnight(year, month, day)[0] < stop_ts)]
+        if days:
+            plan.append((path, days))
+    return plan
+
+
+def scan_file(path: Path) -> list[dict]:
+    """Check the structure of a .WLK file, without decoding its records.
+
+    The header, the day indexes, the record type of every record, and the packed time of every
+    weather data record are checked. Returns a list of the problems found, each a dict with
+    keys 'path', 'day' (None for problems with the whole file), and 'problem'. An empty list
+    means the file can be imported.
+    """
+    problems = []
+
+    def problem(message: str, day: Optional[int] = None):
+        problems.append({'path': str(path), 'day': day, 'problem': message})
+
+    try:
+        year, month = wlk_year_month(path)
+        if not 1 <= month <= 12:
+            raise ValueError
+    except ValueError:
+        problem("Name is not of the form YYYY-MM.wlk")
+        return problems
+    data = path.read_bytes()
+    if len(data) < header_struct.size:
+        problem(f"File is too short for a header ({len(data)} bytes)")
+        return problems
+    try:
+        total_records, day_indexes = parse_header(data)
+    except ValueError as e:
+        problem(str(e))
+        return problems
+
+    n_records, extra = divmod(len(data) - header_struct.size, 88)
+    if extra:
+        problem(f"File ends with a partial record of {extra} bytes")
+    if total_records != n_records:
+        problem(f"Header says there are {total_records} records, but the file holds "
+                f"{n_records}")
+
+    days_in_month = calendar.monthrange(year, month)[1]
+    # Every record type byte, and where each day's records lie
+    record_types = data[header_struct.size::88][:n_records]
+    spans = []
+    for day in range(1, 32):
+        records_in_day, start_pos = day_indexes[day].records_in_day, day_indexes[day].start_pos
+        if records_in_day == 0:
+            continue
+        if records_in_day < 0 or start_pos < 0:
+            problem(f"Invalid day index: {records_in_day} records at {start_pos}", day)
+            continue
+        if day > days_in_month:
+            problem(f"Day does not exist, but has {records_in_day} records", day)
+            continue
+        stop_pos = start_pos + records_in_day
+        if stop_pos > n_records:
+            problem(f"Records {start_pos} to {stop_pos - 1} run past the end of the file, "
+                    f"which holds {n_records}", day)
+            stop_pos = n_records
+        spans.append((start_pos, stop_pos, day))
+
+        bad_types = sorted(set(record_types[start_pos:stop_pos]) - {1, 2, 3})
+        if bad_types:
+            problem(f"Unknown record types {bad_types}", day)
+        bad_times = [packed_time for i in range(start_pos, stop_pos) if record_types[i] == 1
+                     for packed_time in struct.unpack_from('<h', data,
+                                                           header_struct.size + 88 * i + 4)
+                     if not 0 <= packed_time <= 1440]
+        if bad_times:
+            problem(f"{len(bad_times)} records with an invalid packed time, "
+                    f"such as {bad_times[0]}", day)
+
+    # The days must not share records.
+    spans.sort()
+    for (_, stop_pos, day), (next_start, _, next_day) in zip(spans, spans[1:]):
+        if next_start < stop_pos:
+            problem(f"Records overlap those of day {next_day}", day)
+    return problems
+
+
+def scan_files(paths: Iterable[Path], jobs: int = 1) -> Iterator[tuple[Path, list[dict]]]:
+    """Scan files with scan_file(), in a pool of jobs worker processes if jobs is greater than
+    1. Yields (path, problems) for each file, in order."""
+    paths = list(paths)
+    if jobs <= 1:
+        for path in paths:
+            yield path, scan_file(path)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from zip(paths, executor.map(scan_file, paths))
+
+
+def date_range(start: Optional[str] = None,
+               end: Optional[str] = None) -> tuple[Optional[int], Optional[int]]:
+    """Convert inclusive start and end dates, in the form YYYY-MM-DD, into the timestamps
+    since_ts and stop_ts that select their records: since_ts < dateTime <= stop_ts. A missing
+    date gives None."""
+    since_ts = stop_ts = None
+    if start:
+        date = datetime.date.fromisoformat(start)
+        since_ts = local_midnight(date.year, date.month, date.day)[0]
+    if end:
+        date = datetime.date.fromisoformat(end)
+        stop_ts = end_of_day(date.year, date.month, date.day)
+    return since_ts, stop_ts
+
+
+def archive_fieldnames() -> list[str]:
+    """Return every type an archive record can hold. 'dateTime' is first, the rest are sorted."""
+    fieldnames = {'usUnits', 'interval', 'rxCheckPercent'}
+    fieldnames.update(obs_type for obs_type in weather_data_names if obs_type in archive_map)
+    return ['dateTime'] + sorted(fieldnames)
+
+
+def write_csv(csvfile, fieldnames: list[str], records: Iterable[dict]) -> int:
+    """Write records to an open file as CSV. Returns the number of records written."""
+    import csv
+    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+    writer.writeheader()
+    count = 0
+    for count, record in enumerate(records, 1):
+        writer.writerow(record)
+    return count
+
+
+# In the columnar output formats, these types are stored as integers. All others are floats.
+integer_types = {'dateTime', 'usUnits', 'interval', 'forecastRule'}
+
+
+class RecordTable(Sequence):
+    """A compact, in-memory store of archive records.
+
+    Each type is stored as a typed array, with a parallel array of flags that marks which
+    values are present. A record takes about 9 bytes per type, instead of a dict with a key and
+    a float object for each. Indexing the table returns a RecordView, a read-only mapping that
+    can stand in for the record's dict.
+    """
+
+    def __init__(self, fieldnames: Optional[Iterable[str]] = None, records: Iterable[dict] = ()):
+        self.fieldnames = list(fieldnames) if fieldnames is not None else archive_fieldnames()
+        self._columns = {name: i for i, name in enumerate(self.fieldnames)}
+        self._values = [array.array('q' if name in integer_types else 'd')
+                        for name in self.fieldnames]
+        self._present = [bytearray() for _ in self.fieldnames]
+        self._length = 0
+        self.extend(records)
+
+    def append(self, record: dict):
+        if not record.keys() <= self._columns.keys():
+            raise KeyError(f"Unknown types: {sorted(record.keys() - self._columns.keys())}")
+        for name, values, present in zip(self.fieldnames, self._values, self._present):
+            val = record.get(name)
+            if val is None:
+                values.append(0)
+                present.append(0)
+            else:
+                values.append(val)
+                present.append(1)
+        self._length += 1
+
+    def extend(self, records: Iterable[dict]):
+        for record in records:
+            self.append(record)
+
+    def present_fieldnames(self) -> list[str]:
+        """Return the types that at least one record holds, in the order of fieldnames."""
+        return [name for name, present in zip(self.fieldnames, self._present) if 1 in present]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [RecordView(self, i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("RecordTable index out of range")
+        return RecordView(self, index)
+
+
+class RecordView(Mapping):
+    """A read-only view of one record in a RecordTable. Missing values are absent, as they are
+    from a decoded record."""
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table: RecordTable, row: int):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, name: str):
+        table = self._table
+        column = table._columns[name]
+        if not table._present[column][self._row]:
+            raise KeyError(name)
+        return table._values[column][self._row]
+
+    def __iter__(self) -> Iterator[str]:
+        row = self._row
+        return (name for name, present in zip(self._table.fieldnames, self._table._present)
+                if present[row])
+
+    def __len__(self) -> int:
+        row = self._row
+        return sum(present[row] for present in self._table._present)
+
+    def __repr__(self):
+        return f"RecordView({dict(self)})"
+
+
+def _gen_batches(records: Iterable[dict], batch_size: int) -> Iterator[list[dict]]:
+    """Group records into lists of up to batch_size records."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_arrow(output: str, fieldnames: list[str], records: Iterable[dict],
+                fmt: str = 'parquet', batch_size: int = 65536,
+                int_types: Optional[set[str]] = None) -> int:
+    """Write records to an Apache Parquet file (fmt='parquet'), or an Arrow IPC file
+    (fmt='arrow'). Records are written as they arrive, batch_size records per row group.
+    The types in int_types (default integer_types) are stored as integers. Missing values are
+    stored as nulls. Requires pyarrow. Returns the number of records written."""
+    import pyarrow
+
+    if int_types is None:
+        int_types = integer_types
+
+    schema = pyarrow.schema([(obs_type,
+                              pyarrow.int64() if obs_type in int_types else pyarrow.float64())
+                             for obs_type in fieldnames])
+    if fmt == 'parquet':
+        import pyarrow.parquet
+        writer = pyarrow.parquet.ParquetWriter(output, schema)
+    elif fmt == 'arrow':
+        writer = pyarrow.ipc.new_file(output, schema,
+                                      options=pyarrow.ipc.IpcWriteOptions(compression='zstd'))
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+
+    count = 0
+    with writer:
+        for batch in _gen_batches(records, batch_size):
+            columns = {obs_type: [record.get(obs_type) for record in batch]
+                       for obs_type in fieldnames}
+            writer.write_table(pyarrow.Table.from_pydict(columns, schema=schema))
+            count += len(batch)
+    return count
+
+
+def write_npz(output: str, fieldnames: list[str], records: Iterable[dict],
+              batch_size: int = 65536, int_types: Optional[set[str]] = None) -> int:
+    """Write records to a compressed NumPy .npz file, one array per type. Records are converted
+    to typed arrays batch by batch as they arrive, but the file itself can only be written at
+    the end. The types in int_types (default integer_types) are stored as integers. Missing
+    floats are stored as NaN. An integer type with missing values also gets a boolean array
+    '<type>_mask', which is True where the value is missing. Returns the number of records
+    written."""
+    if _get_numpy() is None:
+        raise ImportError("The npz format requires NumPy")
+    if int_types is None:
+        int_types = integer_types
+
+    chunks = {obs_type: [] for obs_type in fieldnames}
+    count = 0
+    for batch in _gen_batches(records, batch_size):
+        for obs_type in fieldnames:
+            values = [record.get(obs_type) for record in batch]
+            if obs_type in int_types:
+                chunks[obs_type].append(numpy.ma.masked_array(
+                    [0 if val is None else val for val in values],
+                    mask=[val is None for val in values], dtype=numpy.int64))
+            else:
+                # None becomes NaN
+                chunks[obs_type].append(numpy.array(values, dtype=numpy.float64))
+        count += len(batch)
+
+    arrays = {}
+    for obs_type in fieldnames:
+        if obs_type in int_types:
+            column = numpy.ma.concatenate(chunks[obs_type]) if count \
+                else numpy.ma.masked_array([], dtype=numpy.int64)
+            arrays[obs_type] = column.filled(0)
+            if numpy.ma.is_masked(column):
+                arrays[obs_type + '_mask'] = numpy.ma.getmaskarray(column)
+        else:
+            arrays[obs_type] = numpy.concatenate(chunks[obs_type]) if count \
+                else numpy.array([], dtype=numpy.float64)
+    numpy.savez_compressed(output, **arrays)
+    return count
+
+
+def _insert_rows(connection, sql_insert_stmt: str, rows: list[list]) -> int:
+    """Insert rows in a single transaction. If any row is a duplicate, insert them again one at
+    a time, skipping the duplicates. Returns the number of rows inserted."""
+    import sqlite3
+    import weedb
+
+    try:
+        with weedb.Transaction(connection) as cursor:
+            if hasattr(cursor, 'executemany'):
+                cursor.executemany(sql_insert_stmt, rows)
+            else:
+                # Not every weedb driver offers executemany()
+                for row in rows:
+                    cursor.execute(sql_insert_stmt, row)
+        return len(rows)
+    except (weedb.IntegrityError, sqlite3.IntegrityError):
+        # executemany() is not wrapped by weedb, so it can raise the sqlite3 exception.
+        pass
+
+    count = 0
+    with weedb.Transaction(connection) as cursor:
+        for row in rows:
+            try:
+                cursor.execute(sql_insert_stmt, row)
+                count += 1
+            except weedb.IntegrityError:
+                pass
+    return count
+
+
+def bulk_load(manager, records: Iterable[dict], batch_size: int = 10000) -> int:
+    """Insert records directly into the archive table of a WeeWX database manager, bypassing
+    the engine and its services. Records are inserted batch_size at a time, each batch in a
+    single transaction. Afterward, the daily summaries are rebuilt once, if the manager keeps
+    them. Derived types that the engine would calculate, such as dewpoint, are not added.
+
+    Records with a timestamp already in the database are skipped. Returns the number of
+    records inserted.
+    """
+    import weewx.units
+
+    # The database's unit system. If the database is empty, it will be the unit system of
+    # the records.
+    unit_system = manager.std_unit_system if manager.std_unit_system is not None else weewx.US
+    possible_keys = set(archive_fieldnames())
+    key_list = [key for key in manager.sqlkeys if key in possible_keys]
+    sql_insert_stmt = "INSERT INTO %s (%s) VALUES (%s)" % (manager.table_name,
+                                                          ','.join(key_list),
+                                                          ','.join('?' * len(key_list)))
+
+    count = 0
+    first_ts = last_ts = None
+    for batch in _gen_batches(records, batch_size):
+        rows = []
+        for record in batch:
+            if record['usUnits'] != unit_system:
+                record = weewx.units.to_std_system(record, unit_system)
+            rows.append([record.get(key) for key in key_list])
+        count += _insert_rows(manager.connection, sql_insert_stmt, rows)
+        if first_ts is None:
+            first_ts = batch[0]['dateTime']
+        last_ts = batch[-1]['dateTime']
+
+    if not count:
+        return 0
+
+    # Update the manager's cached values, as addRecord() would have done.
+    manager.std_unit_system = unit_system
+    manager.first_timestamp = first_ts if manager.first_timestamp is None \
+        else min(first_ts, manager.first_timestamp)
+    manager.last_timestamp = last_ts if manager.last_timestamp is None \
+        else max(last_ts, manager.last_timestamp)
+
+    if hasattr(manager, 'backfill_day_summary'):
+        try:
+            # If the summaries were complete, rebuild only the days that were loaded.
+            manager.backfill_day_summary(datetime.date.fromtimestamp(first_ts),
+                                         datetime.date.fromtimestamp(last_ts),
+                                         progress_fn=None)
+        except weewx.ViolatedPrecondition:
+            # They were not (e.g., the database was empty). Let the manager work out where
+            # to start.
+            manager.backfill_day_summary(progress_fn=None)
+    return count
+
+
+def bulk_load_groups(config_dict: dict, groups: Iterable[FileGroup],
+                     gen_records: Callable[..., Iterator[dict]], jobs: int = 1,
+                     since_ts: Optional[int] = None,
+                     stop_ts: Optional[int] = None) -> dict[str, int]:
+    """Bulk load several groups of files, each into the database of its binding, or wx_binding
+    if it has none. In each database, only records newer than its newest record are loaded. If
+    jobs is greater than 1, all the groups share one pool of that many worker processes.
+    Returns the number of records loaded for each group, keyed by the name of the group."""
+    import weewx.manager
+
+    counts = {}
+    with contextlib.ExitStack() as stack:
+        executor = None
+        if jobs > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=jobs))
+        for group in groups:
+            with weewx.manager.open_manager_with_config(config_dict,
+                                                        group.binding or 'wx_binding',
+                                                        initialize=True) as manager:
+                last_ts = manager.lastGoodStamp()
+                if since_ts is not None and last_ts is not None:
+                    last_ts = max(since_ts, last_ts)
+                records = gen_files(group.wlk_files, gen_records, group.vantage_model,
+                                    group.vantage_iss_id,
+                                    since_ts=last_ts if last_ts is not None else since_ts,
+                                    jobs=jobs, stop_ts=stop_ts, executor=executor)
+                counts[group.name] = bulk_load(manager, records)
+    return counts
+
+
+def gen_polls(watcher: WLKWatcher, poll_interval: float,
+              since_ts: Optional[Callable[[], Optional[int]]] = None) -> Iterator[list[dict]]:
+    """Poll a watcher forever, every poll_interval seconds. Yields the new records of each
+    poll, which can be an empty list. If since_ts is given, it is called before each poll for
+    a timestamp that the records must be newer than."""
+    while True:
+        yield watcher.poll(since_ts() if since_ts else None)
+        time.sleep(poll_interval)
+
+
+def resume_csv(path: str) -> Optional[int]:
+    """Prepare a CSV file written by --follow to be appended to. Returns the dateTime of its
+    last record, or None if the file does not exist or holds no records. A partial last line,
+    left by a run that was killed while writing, is removed."""
     import csv
-    import sys
+
+    try:
+        fd = open(path, 'r+b')
+    except FileNotFoundError:
+        return None
+    with fd:
+        header = fd.readline()
+        if not header.endswith(b'\n'):
+            # Not even a whole header. Start again.
+            fd.truncate(0)
+            return None
+        size = fd.seek(0, os.SEEK_END)
+        # Read back far enough to hold the last line. Rows are a few hundred bytes long.
+        start = max(size - 65536, len(header))
+        fd.seek(start)
+        tail = fd.read()
+        if tail and not tail.endswith(b'\n'):
+            cut = tail.rfind(b'\n') + 1
+            fd.truncate(start + cut)
+            tail = tail[:cut]
+        lines = tail.splitlines()
+        if start > len(header):
+            # The first line read is probably not whole
+            lines = lines[1:]
+        if not lines:
+            return None
+        names = next(csv.reader([header.decode()]))
+        row = next(csv.reader([lines[-1].decode()]))
+        return int(row[names.index('dateTime')])
+
+
+def follow(args):
+    """Carry out the --follow option of the converter."""
+    since_ts, _ = date_range(args.start, None)
+    if args.output and not args.to_database:
+        # Resume after the last record already in the file.
+        last_ts = resume_csv(args.output)
+        if last_ts is not None:
+            since_ts = last_ts if since_ts is None else max(since_ts, last_ts)
+    watcher = WLKWatcher(args.wlk_files, args.vantage_model, args.vantage_iss_id, since_ts)
+    try:
+        if args.to_database:
+            import weecfg
+            import weewx.manager
+            _, config_dict = weecfg.read_config(args.config)
+            with weewx.manager.open_manager_with_config(config_dict, args.binding,
+                                                        initialize=True) as manager:
+                for records in gen_polls(watcher, args.poll_interval, manager.lastGoodStamp):
+                    if records:
+                        print(f"Loaded {bulk_load(manager, records)} records.", flush=True)
+        else:
+            import csv
+            with open(args.output, 'a', newline='') if args.output \
+                    else contextlib.nullcontext(sys.stdout) as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=archive_fieldnames())
+                if not args.output or not csvfile.tell():
+                    writer.writeheader()
+                for records in gen_polls(watcher, args.poll_interval):
+                    writer.writerows(records)
+                    csvfile.flush()
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
     parser = argparse.ArgumentParser(
-        description="Read .WLK weather files and save weather data records to a CSV file.")
+        description="Read .WLK weather files and save weather data records to a CSV file, "
+                    "or to a columnar Parquet, Arrow IPC, or NumPy .npz file.")
     parser.version = "1.0"
-    parser.add_argument("wlk_files", nargs='+', help="Input .WLK files")
-    parser.add_argument("--output", help="Output CSV file. If not specified, print to stdout.")
+    parser.add_argument("wlk_files", nargs='*', help="Input .WLK files")
+    parser.add_argument("--output", help="Output file. If not specified, print CSV to stdout.")
+    parser.add_argument("--format", choices=['csv', 'parquet', 'arrow', 'npz'], default='csv',
+                        help="Output format. 'parquet' and 'arrow' require pyarrow; "
+                             "'npz' requires numpy. Default is 'csv'.")
     parser.add_argument("--model", dest='vantage_model', type=int, default=2,
                         help="Vantage model type (1=Pro, 2=Pro2 or Vue)")
     parser.add_argument("--iss-id", dest='vantage_iss_id', type=int, default=1,
                         help="Vantage ISS ID")
+    parser.add_argument("--engine", choices=['auto', 'numpy', 'python'], default='auto',
+                        help="Decode engine. 'auto' uses numpy if it is installed.")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Number of worker processes used to decode files. Default is 1.")
+    parser.add_argument("--stream", action='store_true',
+                        help="Write each record as soon as it is decoded, instead of reading "
+                             "them all first. Every possible column is included.")
+    parser.add_argument("--to-database", action='store_true',
+                        help="Load the records straight into the WeeWX database given by "
+                             "--config and --binding, instead of writing a file. Only records "
+                             "newer than the newest one in the database are loaded. The WeeWX "
+                             "engine is bypassed, so derived types such as dewpoint are not "
+                             "calculated.")
+    parser.add_argument("--daily", action='store_true',
+                        help="Write the daily aggregates held in the daily summary records, "
+                             "instead of the archive records.")
+    parser.add_argument("--validate-days", action='store_true',
+                        help="Check the daily summaries of the WeeWX database given by --config "
+                             "and --binding against the daily summary records, and print the "
+                             "days that disagree.")
+    parser.add_argument("--config", help="Path to the WeeWX configuration file. "
+                                         "Used by --to-database and --validate-days.")
+    parser.add_argument("--groups", action='store_true',
+                        help="With --to-database, load every group of files in the [WLK] "
+                             "stanza of --config, each into its own database, instead of the "
+                             "files given on the command line.")
+    parser.add_argument("--binding", default='wx_binding',
+                        help="Data binding of the database. Used by --to-database and "
+                             "--validate-days. Default is 'wx_binding'.")
+    parser.add_argument("--start", help="Include only records on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Include only records on or before this date (YYYY-MM-DD)")
+    parser.add_argument("--cache-dir",
+                        help="Directory of a cache of decoded files. Files that have not changed "
+                             "since they were cached are not decoded again. Files are decoded with "
+                             "the numpy engine, so this cannot be used with --engine python.")
+    parser.add_argument("--cache-size", type=int, default=1024,
+                        help="Maximum size of the cache in megabytes. Default is 1024.")
+    parser.add_argument("--catalog",
+                        help="Path to a catalog of the files. It is created if it does not "
+                             "exist, and updated for files that have changed. It lets the "
+                             "files and days to read be planned from their headers alone.")
+    parser.add_argument("--validate", action='store_true',
+                        help="Check the structure of the files, without decoding them, and "
+                             "print every problem found. Uses --jobs worker processes.")
+    parser.add_argument("--plan", action='store_true',
+                        help="Print which files and days hold records in the range given by "
+                             "--start and --end, without decoding any records.")
+    parser.add_argument("--follow", action='store_true',
+                        help="After reading the files, keep watching them, and write or load "
+                             "records as WeatherLink adds them. Works with CSV output and "
+                             "--to-database. Stop with Ctrl-C.")
+    parser.add_argument("--poll-interval", type=float, default=60.0,
+                        help="Seconds between looks at the files with --follow. Default is 60.")
+    parser.add_argument("--prefetch", type=int, default=0,
+                        help="Read and decode records in a background thread, keeping up to "
+                             "this many chunks of 1024 records ready. Default is 0 (off).")
+    parser.add_argument("--stats", action='store_true',
+                        help="Log progress to stderr while decoding, then print the counters "
+                             "and stage times of the import to stderr, as JSON.")
+    parser.add_argument("--progress-interval", type=float, default=10.0,
+                        help="Seconds between progress lines of --stats. Default is 10.")
     args = parser.parse_args()
+    gen_records = select_engine(args.engine)
+    if args.cache_dir:
+        if args.engine == 'python':
+            parser.error("--cache-dir decodes with the numpy engine, and cannot be used with "
+                         "--engine python")
+        gen_records = DecodeCache(args.cache_dir, args.cache_size * 1024 * 1024).gen_records
+
+    if args.format != 'csv' and not args.output:
+        parser.error(f"--format={args.format} requires --output")
+    if args.format in ('parquet', 'arrow'):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error(f"--format={args.format} requires pyarrow. Use --format=npz instead.")
+    elif args.format == 'npz' and _get_numpy() is None:
+        parser.error("--format=npz requires numpy")
+
+    if args.groups:
+        import weecfg
+        if not args.to_database or not args.config:
+            parser.error("--groups requires --to-database and --config")
+        _, config_dict = weecfg.read_config(args.config)
+        since_ts, stop_ts = date_range(args.start, args.end)
+        groups = read_groups(config_dict.get('WLK', {}))
+        counts = bulk_load_groups(config_dict, groups, gen_records, args.jobs, since_ts, stop_ts)
+        for group in groups:
+            print(f"{group}: loaded {counts[group.name]} records.")
+        return
+    if not args.wlk_files:
+        parser.error("No .WLK files given")
+    if args.validate:
+        count = 0
+        paths = find_files(args.wlk_files)
+        for _, problems in scan_files(paths, args.jobs):
+            for problem in problems:
+                print(f"{problem['path']}, day {problem['day'] or '-'}: {problem['problem']}")
+            count += len(problems)
+        print(f"Scanned {len(paths)} files. Found {count} problems.")
+        sys.exit(1 if count else 0)
+    if args.follow:
+        if args.format != 'csv' or args.daily:
+            parser.error("--follow works only with CSV output of archive records")
+        if args.to_database and not args.config:
+            parser.error("--to-database requires --config")
+        follow(args)
+        return
+
+    # Work out which files and days to read.
+    wlk_files = find_files(args.wlk_files)
+    since_ts, stop_ts = date_range(args.start, args.end)
+    catalog = build_catalog(wlk_files, args.catalog) if args.catalog or args.plan else None
+    plan = plan_range(wlk_files, since_ts, stop_ts, catalog)
+    if args.plan:
+        total = 0
+        for path, days in plan:
+            entry = catalog[str(path.resolve())]
+            count = sum(entry['days'][str(day)][0] for day in days)
+            total += count
+            print(f"{path}: days {', '.join(str(day) for day in days)} ({count} records)")
+        print(f"{len(plan)} files, {total} records, including daily summary records.")
+        return
+    wlk_files = [path for path, _ in plan]
+    progress = None
+    if args.stats:
+        logging.basicConfig(level=logging.INFO, stream=sys.stderr, format="%(message)s")
+        progress = ImportProgress(plan, catalog, args.progress_interval)
+
+    def gen_archive(since: Optional[int]) -> Iterator[dict]:
+        records = gen_files(wlk_files, gen_records, args.vantage_model, args.vantage_iss_id,
+                            since_ts=since, jobs=args.jobs, stop_ts=stop_ts, progress=progress)
+        if args.prefetch > 0:
+            records = gen_prefetched(records, args.prefetch)
+        yield from records
+        if progress is not None:
+            print(json.dumps(progress.summary(), indent=2), file=sys.stderr)
+
+    def in_range(daily: dict) -> bool:
+        return (since_ts is None or daily['dateTime'] >= since_ts) \
+            and (stop_ts is None or daily['dateTime'] < stop_ts)
+
+    if args.validate_days:
+        import weecfg
+        import weeutil.weeutil
+        import weewx.manager
+        if not args.config:
+            parser.error("--validate-days requires --config")
+        _, config_dict = weecfg.read_config(args.config)
+        daily_records = (daily for path in wlk_files
+                         for daily in gen_wlk_daily(path) if in_range(daily))
+        count = 0
+        with weewx.manager.open_manager_with_config(config_dict, args.binding) as manager:
+            for problem in validate_day_summaries(manager, daily_records):
+                print(f"{weeutil.weeutil.timestamp_to_string(problem['dateTime'])}: "
+                      f"{problem['field']}={problem['wlk']}, but {problem['aggregate']} of "
+                      f"{problem['obs_type']} in the database is {problem['database']}")
+                count += 1
+        print(f"Found {count} discrepancies.")
+        return
+
+    if args.to_database:
+        import weecfg
+        import weewx.manager
+        if not args.config:
+            parser.error("--to-database requires --config")
+        _, config_dict = weecfg.read_config(args.config)
+        with weewx.manager.open_manager_with_config(config_dict, args.binding,
+                                                    initialize=True) as manager:
+            last_ts = manager.lastGoodStamp()
+            if since_ts is not None and last_ts is not None:
+                last_ts = max(since_ts, last_ts)
+            records = gen_archive(last_ts if last_ts is not None else since_ts)
+            count = bulk_load(manager, records)
+        print(f"Loaded {count} records.")
+        return
+
+    if args.daily:
+        records = (daily for path in wlk_files for daily in gen_wlk_daily(path) if in_range(daily))
+        all_fieldnames = daily_fieldnames()
+        int_types = daily_integer_types()
+    else:
+        records = gen_archive(since_ts)
+        all_fieldnames = archive_fieldnames()
+        int_types = integer_types
+
+    if args.format in ('parquet', 'arrow'):
+        count = write_arrow(args.output, all_fieldnames, records, args.format,
+                            int_types=int_types)
+        print(f"Read {count} records.")
+        return
+    elif args.format == 'npz':
+        count = write_npz(args.output, all_fieldnames, records, int_types=int_types)
+        print(f"Read {count} records.")
+        return
+
+    if args.stream:
+        # The columns are known up front, so nothing needs to be held in memory.
+        if args.output:
+            with open(args.output, 'w', newline='') as csvfile:
+                count = write_csv(csvfile, all_fieldnames, records)
+        else:
+            try:
+                count = write_csv(sys.stdout, all_fieldnames, records)
+            except BrokenPipeError:
+                # The downstream reader quit early (e.g., 'head'). Silence the error Python
+                # would otherwise raise when it flushes stdout at exit.
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+                sys.exit(1)
+        # Keep stdout clean for the CSV data.
+        print(f"Read {count} records.", file=sys.stderr)
+        return
 
-    all_records = []
-    fieldnames = set()
-    for filename in find_files(args.wlk_files):
-        path = Path(filename)
-        for record in gen_wlk(path, args.vantage_model, args.vantage_iss_id):
+    if args.daily:
+        all_records = []
+        fieldnames = set()
+        for record in records:
             all_records.append(record)
             fieldnames.update(record.keys())
+    else:
+        # Archive records have a fixed schema, so they can be held compactly.
+        all_records = RecordTable(all_fieldnames, records)
+        fieldnames = all_records.present_fieldnames()
 
     if not all_records:
         return
@@ -514,15 +2750,9 @@ def main():
 
     if args.output:
         with open(args.output, 'w', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=sorted_fieldnames)
-            writer.writeheader()
-            for record in all_records:
-                writer.writerow(record)
+            write_csv(csvfile, sorted_fieldnames, all_records)
     else:
-        writer = csv.DictWriter(sys.stdout, fieldnames=sorted_fieldnames)
-        writer.writeheader()
-        for record in all_records:
-            writer.writerow(record)
+        write_csv(sys.stdout, sorted_fieldnames, all_records)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,25 @@
+#
+#    Copyright (c) 2026 Tom Keffer <tkeffer@gmail.com>
+#
+#    See the file LICENSE.txt for your full rights.
+#
+"""Shared fixtures. The importer and the synthetic .WLK writer are loaded from the bench
+directory, which knows how to import bin/user/import-wlk.py."""
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'bench'))
+
+
+@pytest.fixture(params=['UTC', 'America/Los_Angeles'])
+def timezone(request, monkeypatch):
+    """Run a test in UTC, and in a time zone with DST transitions."""
+    monkeypatch.setenv('TZ', request.param)
+    time.tzset()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
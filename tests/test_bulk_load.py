@@ -0,0 +1,97 @@
+#
+#    Copyright (c) 2026 Tom Keffer <tkeffer@gmail.com>
+#
+#    See the file LICENSE.txt for your full rights.
+#
+"""Round trips of bulk_load() and --to-database through a local SQLite database."""
+import sys
+
+import pytest
+
+from synthetic_wlk import wlk, write_archive
+
+weewx_manager = pytest.importorskip('weewx.manager')
+import weewx.schemas.wview_extended  # noqa: E402
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return write_archive(tmp_path / 'wlk', 2018, 1, months=2, interval=30)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    database_dict = {'database_name': str(tmp_path / 'weewx.sdb'), 'driver': 'weedb.sqlite'}
+    with weewx_manager.DaySummaryManager.open_with_create(
+            database_dict, schema=weewx.schemas.wview_extended.schema) as manager:
+        yield manager
+
+
+def _count(manager) -> int:
+    return manager.getSql(f"SELECT COUNT(*) FROM {manager.table_name}")[0]
+
+
+def test_round_trip(manager, paths):
+    records = list(wlk.gen_wlk(paths[0]))
+    assert wlk.bulk_load(manager, iter(records), batch_size=100) == len(records)
+    assert _count(manager) == len(records)
+    assert manager.firstGoodStamp() == records[0]['dateTime']
+    assert manager.lastGoodStamp() == records[-1]['dateTime']
+
+    record = records[len(records) // 2]
+    stored = manager.getRecord(record['dateTime'])
+    for obs_type in ('outTemp', 'barometer', 'rain', 'windSpeed', 'rxCheckPercent'):
+        assert stored[obs_type] == pytest.approx(record.get(obs_type))
+    # The daily summaries were rebuilt.
+    assert manager.getSql("SELECT COUNT(*) FROM archive_day_outTemp")[0] == 31
+
+
+def test_resume_after_newest(manager, paths):
+    first = wlk.bulk_load(manager, wlk.gen_wlk(paths[0]))
+    last_ts = manager.lastGoodStamp()
+    # As --to-database does: only records newer than the newest in the database.
+    records = wlk.gen_files(paths, wlk.gen_wlk, since_ts=last_ts)
+    second = wlk.bulk_load(manager, records)
+    assert second == len(list(wlk.gen_wlk(paths[1])))
+    assert _count(manager) == first + second
+
+
+def test_skips_duplicates(manager, paths):
+    records = list(wlk.gen_wlk(paths[0]))
+    half = len(records) // 2
+    assert wlk.bulk_load(manager, iter(records[:half])) == half
+    # Every batch that overlaps the database falls back to inserting one row at a time.
+    assert wlk.bulk_load(manager, iter(records), batch_size=100) == len(records) - half
+    assert wlk.bulk_load(manager, iter(records)) == 0
+    assert _count(manager) == len(records)
+
+
+def test_to_database_resumes(tmp_path, paths, monkeypatch, capsys):
+    config = tmp_path / 'weewx.conf'
+    config.write_text(f"""
+[DataBindings]
+    [[wx_binding]]
+        database = archive_sqlite
+        table_name = archive
+        manager = weewx.manager.DaySummaryManager
+        schema = weewx.schemas.wview_extended.schema
+[Databases]
+    [[archive_sqlite]]
+        database_name = weewx.sdb
+        database_type = SQLite
+[DatabaseTypes]
+    [[SQLite]]
+        driver = weedb.sqlite
+        SQLITE_ROOT = {tmp_path}
+""")
+    total = sum(len(list(wlk.gen_wlk(path))) for path in paths)
+
+    def load(*files) -> str:
+        monkeypatch.setattr(sys, 'argv', ['import-wlk.py', '--to-database',
+                                          '--config', str(config)] + [str(f) for f in files])
+        wlk.main()
+        return capsys.readouterr().out
+
+    assert f"Loaded {len(list(wlk.gen_wlk(paths[0])))} records." in load(paths[0])
+    assert f"Loaded {total - len(list(wlk.gen_wlk(paths[0])))} records." in load(*paths)
+    assert "Loaded 0 records." in load(*paths)
@@ -0,0 +1,98 @@
+#
+#    Copyright (c) 2026 Tom Keffer <tkeffer@gmail.com>
+#
+#    See the file LICENSE.txt for your full rights.
+#
+"""The on-disk cache of decoded files."""
+import logging
+import os
+import time
+
+import pytest
+
+from synthetic_wlk import wlk, write_wlk
+
+numpy = pytest.importorskip('numpy')
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return [write_wlk(tmp_path, 2018, month, interval=30, days=[1, 2]) for month in (1, 2, 3)]
+
+
+def _entry(cache, path, vantage_model=2, vantage_iss_id=1) -> str:
+    return os.path.join(cache.cache_dir, cache.key(path, vantage_model, vantage_iss_id) + '.npz')
+
+
+def _entries(cache) -> set[str]:
+    return {entry.path for entry in os.scandir(cache.cache_dir)}
+
+
+def test_hit(tmp_path, paths):
+    cache = wlk.DecodeCache(str(tmp_path / 'cache'))
+    assert list(cache.gen_records(paths[0])) == list(wlk.gen_wlk(paths[0]))
+    assert _entries(cache) == {_entry(cache, paths[0])}
+    # The second time, the file is not decoded.
+    stats = wlk.DecodeStats()
+    assert list(cache.gen_records(paths[0], stats=stats)) == list(wlk.gen_wlk(paths[0]))
+    assert stats.convert == 0
+
+
+@pytest.mark.parametrize('damage', [b'', b'not a zip file', 'truncate'])
+def test_corrupt_entry(tmp_path, paths, caplog, damage):
+    cache = wlk.DecodeCache(str(tmp_path / 'cache'))
+    expected = list(cache.gen_records(paths[0]))
+    entry_path = _entry(cache, paths[0])
+    if damage == 'truncate':
+        with open(entry_path, 'r+b') as fd:
+            fd.truncate(os.path.getsize(entry_path) // 2)
+    else:
+        with open(entry_path, 'wb') as fd:
+            fd.write(damage)
+    with caplog.at_level(logging.WARNING):
+        assert list(cache.gen_records(paths[0])) == expected
+    assert 'corrupt cache entry' in caplog.text
+    # The entry was replaced with a good one.
+    with numpy.load(entry_path) as npz:
+        assert len(npz['dateTime']) == len(expected)
+
+
+def test_key(tmp_path, paths):
+    cache = wlk.DecodeCache(str(tmp_path / 'cache'))
+    iss1 = list(cache.gen_records(paths[0], 2, 1))
+    iss2 = list(cache.gen_records(paths[0], 2, 2))
+    assert _entry(cache, paths[0], 2, 1) != _entry(cache, paths[0], 2, 2)
+    assert len(_entries(cache)) == 2
+    assert iss2 == list(wlk.gen_wlk(paths[0], 2, 2))
+    assert [r['rxCheckPercent'] for r in iss1] != [r['rxCheckPercent'] for r in iss2]
+    # An edited file gets a new key.
+    key = cache.key(paths[0], 2, 1)
+    write_wlk(paths[0].parent, 2018, 1, interval=30, days=[1, 2, 3])
+    assert cache.key(paths[0], 2, 1) != key
+
+
+def test_eviction(tmp_path, paths):
+    size = os.path.getsize(_entry_after_decode(tmp_path / 'probe', paths[0]))
+    # Room for two entries, but not three
+    cache = wlk.DecodeCache(str(tmp_path / 'cache'), max_bytes=int(2.5 * size))
+    cache.decode(paths[0])
+    time.sleep(0.01)
+    cache.decode(paths[1])
+    time.sleep(0.01)
+    # Use the first again, so the second is now the least recently used.
+    cache.decode(paths[0])
+    time.sleep(0.01)
+    cache.decode(paths[2])
+    assert _entries(cache) == {_entry(cache, paths[0]), _entry(cache, paths[2])}
+
+
+def _entry_after_decode(cache_dir, path) -> str:
+    cache = wlk.DecodeCache(str(cache_dir))
+    cache.decode(path)
+    return _entry(cache, path)
+
+
+def test_python_engine_refused(tmp_path):
+    with pytest.raises(ValueError):
+        wlk.WLKDriver({'wlk_files': str(tmp_path / '*.wlk'), 'engine': 'python',
+                       'cache_dir': str(tmp_path / 'cache')})
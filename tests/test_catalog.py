@@ -0,0 +1,98 @@
+#
+#    Copyright (c) 2026 Tom Keffer <tkeffer@gmail.com>
+#
+#    See the file LICENSE.txt for your full rights.
+#
+"""The catalog of file headers: reuse, invalidation, and planning from it."""
+import json
+import os
+
+import pytest
+
+from synthetic_wlk import wlk, write_wlk
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return [write_wlk(tmp_path, 2018, month, interval=60, days=[1, 2, 15])
+            for month in (1, 2, 3)]
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Count the files whose headers are read."""
+    read = []
+    original = wlk.read_catalog_entry
+
+    def read_catalog_entry(path):
+        read.append(path)
+        return original(path)
+
+    monkeypatch.setattr(wlk, 'read_catalog_entry', read_catalog_entry)
+    return read
+
+
+def _saved(catalog_path) -> dict:
+    with open(catalog_path) as fd:
+        return json.load(fd)['files']
+
+
+def test_entries(paths):
+    catalog = wlk.build_catalog(paths[:1])
+    entry = catalog[str(paths[0].resolve())]
+    assert (entry['year'], entry['month']) == (2018, 1)
+    assert sorted(entry['days']) == ['1', '15', '2']
+    assert entry['days']['1'][0] == 24 + 2
+    assert entry['total_records'] == 3 * (24 + 2)
+
+
+def test_reuse(tmp_path, paths, reads):
+    catalog_path = str(tmp_path / 'catalog.json')
+    wlk.build_catalog(paths, catalog_path)
+    assert len(reads) == 3
+    reads.clear()
+    assert wlk.build_catalog(paths, catalog_path) == _saved(catalog_path)
+    assert reads == []
+
+
+def test_keeps_other_files(tmp_path, paths, reads):
+    catalog_path = str(tmp_path / 'catalog.json')
+    wlk.build_catalog(paths[:2], catalog_path)
+    catalog = wlk.build_catalog(paths[2:], catalog_path)
+    assert reads == paths
+    assert set(_saved(catalog_path)) == {str(path.resolve()) for path in paths}
+    assert set(catalog) == set(_saved(catalog_path))
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+
+def test_invalidation(tmp_path, paths, reads):
+    catalog_path = str(tmp_path / 'catalog.json')
+    wlk.build_catalog(paths, catalog_path)
+    reads.clear()
+    # WeatherLink adds a day to February.
+    write_wlk(tmp_path, 2018, 2, interval=60, days=[1, 2, 15, 16])
+    stat = paths[1].stat()
+    os.utime(paths[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    catalog = wlk.build_catalog(paths, catalog_path)
+    assert reads == [paths[1]]
+    assert '16' in catalog[str(paths[1].resolve())]['days']
+    assert '16' in _saved(catalog_path)[str(paths[1].resolve())]['days']
+
+
+def test_version_change(tmp_path, paths, reads):
+    catalog_path = tmp_path / 'catalog.json'
+    catalog_path.write_text(json.dumps({'version': -1, 'files': {'old': {}}}))
+    wlk.build_catalog(paths, str(catalog_path))
+    assert len(reads) == 3
+    assert set(_saved(catalog_path)) == {str(path.resolve()) for path in paths}
+
+
+def test_plan_from_catalog(paths):
+    catalog = wlk.build_catalog(paths)
+    plan = wlk.plan_range(paths, catalog=catalog)
+    assert plan == [(path, [1, 2, 15]) for path in paths]
+    # Without a catalog, every day of each month is planned.
+    assert len(wlk.plan_range(paths[:1])[0][1]) == 31
+    # Only the days that can hold records after the end of January 2.
+    since_ts = wlk.end_of_day(2018, 1, 2)
+    assert wlk.plan_range(paths[:1], since_ts, catalog=catalog) == [(paths[0], [15])]
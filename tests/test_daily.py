@@ -0,0 +1,78 @@
+#
+#    Copyright (c) 2026 Tom Keffer <tkeffer@gmail.com>
+#
+#    See the file LICENSE.txt for your full rights.
+#
+"""Decoding the daily summary records, checked against bytes packed by hand."""
+import pytest
+
+from synthetic_wlk import wlk
+
+# 0x123, 0x456 and 0xABC, packed two to every three bytes. The third byte of each group holds
+# the high nibbles: the first value's in the low half, the second's in the high half.
+PACKED = bytes([0x23, 0x56, 0x41, 0xBC, 0x00, 0x0A])
+
+
+def test_unpack_12bit():
+    assert wlk.unpack_12bit(PACKED, 3) == [0x123, 0x456, 0xABC]
+    assert wlk.unpack_12bit(bytes([0xFF, 0xFF, 0xFF]), 2) == [0xFFF, 0xFFF]
+
+
+def _pack(record_struct, names, formats, **values) -> bytes:
+    """Pack a record. Fields not given are zero."""
+    return record_struct.pack(*(values.get(name, b'' if fmt.endswith('s') else 0)
+                                for fmt, name in zip(formats, names)))
+
+
+@pytest.fixture
+def daily(tmp_path):
+    """The daily record of a file holding only the two summary records of January 5."""
+    # The times of hiOutTemp and lowOutTemp: 14:30 (870 = 0x366) and 05:00 (300 = 0x12C)
+    time_values = bytes([0x66, 0x2C, 0x13]) + bytes(24)
+    summary1 = _pack(wlk.daily_summary1_struct, wlk.daily_summary1_names,
+                     wlk.daily_summary1_formats, dataType=2, dataSpan=1440, hiOutTemp=805,
+                     lowOutTemp=-32768, hiBar=30125, dirHiSpeed=4, dailyRainTotal=250,
+                     timeValues=time_values)
+    summary2 = _pack(wlk.daily_summary2_struct, wlk.daily_summary2_names,
+                     wlk.daily_summary2_formats, dataType=3, numWindPackets=32767,
+                     minSunlight=32767, hiSolar=32767, dirBins=PACKED + bytes(18))
+    day_indexes = [(0, 0)] * 32
+    day_indexes[5] = (2, 0)
+    header = wlk.header_struct.pack(b'WDAT5.0\0\0\0\0\0\0\0\x05\0', 2,
+                                    *(wlk.DayIndex.day_index_struct.pack(*entry)
+                                      for entry in day_indexes))
+    path = tmp_path / '2018-01.wlk'
+    path.write_bytes(header + summary1 + summary2)
+    records = list(wlk.gen_wlk_daily(path))
+    assert len(records) == 1
+    return records[0]
+
+
+def test_measurements(daily):
+    midnight = wlk.local_midnight(2018, 1, 5)[0]
+    assert daily['dateTime'] == midnight
+    assert daily['hiOutTemp'] == pytest.approx(80.5)
+    assert daily['hiBar'] == pytest.approx(30.125)
+    assert daily['dailyRainTotal'] == pytest.approx(0.25)
+    assert daily['dirHiSpeed'] == 90.0
+    # Dash values
+    assert daily['lowOutTemp'] is None
+    assert daily['hiSolar'] is None
+
+
+def test_times(daily):
+    midnight = wlk.local_midnight(2018, 1, 5)[0]
+    assert daily['hiOutTempTime'] == midnight + 870 * 60
+    # No time for a missing low
+    assert daily['lowOutTempTime'] is None
+
+
+def test_counts_have_no_dash(daily):
+    # A full day of ISS packets saturates numWindPackets. It is a count, not missing data.
+    assert daily['dataSpan'] == 1440
+    assert daily['numWindPackets'] == 32767
+    assert daily['minSunlight'] == 32767
+
+
+def test_direction_bins(daily):
+    assert [daily[f'dirBin{i}'] for i in range(4)] == [0x123, 0x456, 0xABC, 0]
@@ -0,0 +1,44 @@
+#
+#    Copyright (c) 2026 Tom Keffer <tkeffer@gmail.com>
+#
+#    See the file LICENSE.txt for your full rights.
+#
+"""The python and numpy engines must decode the same records."""
+import pytest
+
+from synthetic_wlk import RAIN_COLLECTORS, wlk, write_archive
+
+pytest.importorskip('numpy')
+
+
+@pytest.fixture(scope='module')
+def paths(tmp_path_factory):
+    # March and November hold the DST transitions. Each month gets another rain collector.
+    directory = tmp_path_factory.mktemp('wlk')
+    return (write_archive(directory, 2018, 3, months=1)
+            + write_archive(directory, 2018, 10, months=3,
+                            rain_collectors=list(RAIN_COLLECTORS)[1:]))
+
+
+def test_engines_agree(paths, timezone):
+    for path in paths:
+        python_records = list(wlk.gen_wlk(path))
+        assert python_records
+        assert list(wlk.gen_wlk_columnar(path)) == python_records
+
+
+def test_engines_agree_since(paths, timezone):
+    for path in paths:
+        all_records = list(wlk.gen_wlk(path))
+        since_ts = all_records[len(all_records) // 2]['dateTime']
+        python_records = list(wlk.gen_wlk(path, since_ts=since_ts))
+        assert python_records == [r for r in all_records if r['dateTime'] > since_ts]
+        assert list(wlk.gen_wlk_columnar(path, since_ts=since_ts)) == python_records
+
+
+def test_engines_agree_by_day(paths, timezone):
+    path = paths[0]
+    python_days = [(day, records) for day, records in wlk.gen_wlk_days(path, 2, 1, None, None)]
+    numpy_days = [(day, list(wlk.gen_column_records(columns)))
+                  for day, columns in wlk.gen_wlk_day_columns(path)]
+    assert numpy_days == python_days
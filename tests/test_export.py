@@ -0,0 +1,53 @@
+#
+#    Copyright (c) 2026 Tom Keffer <tkeffer@gmail.com>
+#
+#    See the file LICENSE.txt for your full rights.
+#
+"""The columnar output formats of the converter."""
+import sys
+
+import pytest
+
+from synthetic_wlk import wlk, write_wlk
+
+
+@pytest.fixture
+def path(tmp_path):
+    return write_wlk(tmp_path, 2018, 1, interval=60, days=[1, 2])
+
+
+def _main(monkeypatch, *argv):
+    monkeypatch.setattr(sys, 'argv', ['import-wlk.py'] + [str(arg) for arg in argv])
+    wlk.main()
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'arrow'])
+def test_without_pyarrow(monkeypatch, capsys, tmp_path, path, fmt):
+    # A None entry in sys.modules makes the import fail.
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    with pytest.raises(SystemExit) as excinfo:
+        _main(monkeypatch, '--format', fmt, '--output', tmp_path / 'out', path)
+    assert excinfo.value.code == 2
+    assert 'requires pyarrow' in capsys.readouterr().err
+    assert not (tmp_path / 'out').exists()
+
+
+def test_npz(monkeypatch, tmp_path, path):
+    numpy = pytest.importorskip('numpy')
+    output = tmp_path / 'out.npz'
+    _main(monkeypatch, '--format', 'npz', '--output', output, path)
+    records = list(wlk.gen_wlk(path))
+    with numpy.load(output) as npz:
+        assert npz['dateTime'].dtype == numpy.int64
+        assert npz['dateTime'].tolist() == [record['dateTime'] for record in records]
+        assert npz['outTemp'].dtype == numpy.float64
+
+
+def test_parquet(monkeypatch, tmp_path, path):
+    pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+    output = tmp_path / 'out.parquet'
+    _main(monkeypatch, '--format', 'parquet', '--output', output, path)
+    table = pyarrow_parquet.read_table(output)
+    assert str(table.schema.field('dateTime').type) == 'int64'
+    assert str(table.schema.field('outTemp').type) == 'double'
+    assert table.num_rows == len(list(wlk.gen_wlk(path)))
@@ -0,0 +1,116 @@
+#
+#    Copyright (c) 2026 Tom Keffer <tkeffer@gmail.com>
+#
+#    See the file LICENSE.txt for your full rights.
+#
+"""The structural scanner, against damaged copies of a synthetic file."""
+import struct
+
+import pytest
+
+from synthetic_wlk import wlk, write_wlk
+
+RECORDS_IN_DAY = 24 + 2
+
+
+@pytest.fixture
+def path(tmp_path):
+    # Three days of hourly records, each day with its two summary records first.
+    return write_wlk(tmp_path, 2018, 2, interval=60, days=[1, 2, 3])
+
+
+def _rewrite_header(path, total_records=None, **days):
+    """Rewrite the header of a file. Each day_N keyword gives (records_in_day, start_pos)."""
+    data = bytearray(path.read_bytes())
+    total, day_indexes = wlk.parse_header(data)
+    entries = [(index.records_in_day, index.start_pos) for index in day_indexes]
+    for name, entry in days.items():
+        entries[int(name.split('_')[1])] = entry
+    data[:wlk.header_struct.size] = wlk.header_struct.pack(
+        data[:16], total if total_records is None else total_records,
+        *(wlk.DayIndex.day_index_struct.pack(*entry) for entry in entries))
+    path.write_bytes(bytes(data))
+
+
+def _record_offset(day: int, index: int) -> int:
+    """The offset of a record in the file, counting the summary records."""
+    return wlk.header_struct.size + 88 * ((day - 1) * RECORDS_IN_DAY + index)
+
+
+def _problems(path) -> list[tuple]:
+    return [(problem['day'], problem['problem']) for problem in wlk.scan_file(path)]
+
+
+def test_clean(path):
+    assert wlk.scan_file(path) == []
+
+
+def test_bad_name(tmp_path, path):
+    renamed = path.rename(tmp_path / '2018-13.wlk')
+    assert _problems(renamed) == [(None, "Name is not of the form YYYY-MM.wlk")]
+
+
+def test_too_short(path):
+    path.write_bytes(path.read_bytes()[:100])
+    assert _problems(path) == [(None, "File is too short for a header (100 bytes)")]
+
+
+def test_bad_id_code(path):
+    path.write_bytes(b'XXXXXX' + path.read_bytes()[6:])
+    assert len(_problems(path)) == 1
+
+
+def test_truncated(path):
+    path.write_bytes(path.read_bytes()[:-40])
+    total = 3 * RECORDS_IN_DAY
+    assert _problems(path) == [
+        (None, "File ends with a partial record of 48 bytes"),
+        (None, f"Header says there are {total} records, but the file holds {total - 1}"),
+        (3, f"Records {2 * RECORDS_IN_DAY} to {total - 1} run past the end of the file, "
+            f"which holds {total - 1}"),
+    ]
+
+
+def test_wrong_total_records(path):
+    _rewrite_header(path, total_records=3 * RECORDS_IN_DAY + 5)
+    assert _problems(path) == [
+        (None, f"Header says there are {3 * RECORDS_IN_DAY + 5} records, but the file holds "
+               f"{3 * RECORDS_IN_DAY}")]
+
+
+def test_bad_record_type(path):
+    data = bytearray(path.read_bytes())
+    data[_record_offset(2, 5)] = 7
+    path.write_bytes(bytes(data))
+    assert _problems(path) == [(2, "Unknown record types [7]")]
+
+
+def test_bad_packed_time(path):
+    data = bytearray(path.read_bytes())
+    for index in (3, 4):
+        struct.pack_into('<h', data, _record_offset(1, index) + 4, 2000)
+    path.write_bytes(bytes(data))
+    assert _problems(path) == [(1, "2 records with an invalid packed time, such as 2000")]
+
+
+def test_overlapping_days(path):
+    _rewrite_header(path, day_2=(RECORDS_IN_DAY, RECORDS_IN_DAY - 10))
+    assert (1, "Records overlap those of day 2") in _problems(path)
+
+
+def test_day_that_does_not_exist(path):
+    _rewrite_header(path, day_30=(RECORDS_IN_DAY, 0))
+    assert (30, f"Day does not exist, but has {RECORDS_IN_DAY} records") in _problems(path)
+
+
+def test_negative_day_index(path):
+    _rewrite_header(path, day_4=(-3, 0))
+    assert _problems(path) == [(4, "Invalid day index: -3 records at 0")]
+
+
+def test_scan_files_in_parallel(tmp_path, path):
+    other = write_wlk(tmp_path, 2018, 3, interval=60, days=[1])
+    path.write_bytes(path.read_bytes()[:-40])
+    serial = list(wlk.scan_files([path, other]))
+    assert list(wlk.scan_files([path, other], jobs=2)) == serial
+    assert [bool(problems) for _, problems in serial] == [True, False]
@@ -0,0 +1,155 @@
+#
+#    Copyright (c) 2026 Tom Keffer <tkeffer@gmail.com>
+#
+#    See the file LICENSE.txt for your full rights.
+#
+"""Following files as WeatherLink writes them: WLKWatcher, --follow, and the driver's watch."""
+import argparse
+import csv
+import os
+
+import pytest
+
+from synthetic_wlk import wlk, write_wlk
+
+
+def write_partial(src, dst, day: int, count: int):
+    """Write a copy of a .WLK file as WeatherLink would have written it part way through day:
+    the days before it whole, and only the first count records of day, summaries included."""
+    data = src.read_bytes()
+    _, day_indexes = wlk.parse_header(data)
+    entries = []
+    end = 0
+    for index in day_indexes:
+        if index.day_in_month < day and index.records_in_day > 0:
+            entries.append((index.records_in_day, index.start_pos))
+            end = max(end, index.start_pos + index.records_in_day)
+        elif index.day_in_month == day and index.records_in_day > 0:
+            entries.append((count, index.start_pos))
+            end = index.start_pos + count
+        else:
+            entries.append((0, 0))
+    header = wlk.header_struct.pack(data[:16], end, *(wlk.DayIndex.day_index_struct.pack(*e)
+                                                       for e in entries))
+    size = wlk.header_struct.size
+    dst.write_bytes(header + data[size:size + 88 * end])
+    # Make sure the change is seen, even within the resolution of the file system's clock.
+    stat = dst.stat()
+    os.utime(dst, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def source(tmp_path):
+    """A whole file of three days, written somewhere the watcher does not look."""
+    (tmp_path / 'source').mkdir()
+    return write_wlk(tmp_path / 'source', 2018, 1, interval=30, days=[1, 2, 3])
+
+
+@pytest.fixture
+def watched(tmp_path):
+    directory = tmp_path / 'watched'
+    directory.mkdir()
+    return directory
+
+
+def test_partly_written_day(source, watched):
+    expected = list(wlk.gen_wlk(source))
+    path = watched / source.name
+    watcher = wlk.WLKWatcher([str(watched / '*.wlk')])
+    records = []
+    # Day 2 arrives a few records at a time. Each day starts with its 2 summary records.
+    for day, count in ((1, 20), (2, 2), (2, 10), (2, 30), (3, 5)):
+        write_partial(source, path, day, count)
+        new = watcher.poll()
+        assert new == expected[len(records):len(records) + len(new)]
+        records.extend(new)
+        assert watcher.poll() == []
+    assert records == list(wlk.gen_wlk(path))
+    assert watcher.last_ts == records[-1]['dateTime']
+
+
+def test_restart(source, watched):
+    expected = list(wlk.gen_wlk(source))
+    path = watched / source.name
+    write_partial(source, path, 2, 20)
+    first = wlk.WLKWatcher([str(path)]).poll()
+    write_partial(source, path, 3, 10)
+    # A new watcher, started from the last record the first one returned
+    second = wlk.WLKWatcher([str(path)], since_ts=first[-1]['dateTime']).poll()
+    assert first + second == expected[:len(first) + len(second)]
+    assert second[0]['dateTime'] > first[-1]['dateTime']
+
+
+def test_new_month(tmp_path, watched):
+    january = write_wlk(watched, 2018, 1, interval=30, days=[30, 31])
+    watcher = wlk.WLKWatcher([str(watched / '*.wlk')])
+    assert watcher.poll() == list(wlk.gen_wlk(january))
+    february = write_wlk(watched, 2018, 2, interval=30, days=[1])
+    assert watcher.poll() == list(wlk.gen_wlk(february))
+    assert watcher.poll() == []
+
+
+def _follow(monkeypatch, patterns, output):
+    """Run --follow for a single poll."""
+    def gen_polls(watcher, poll_interval, since_ts=None):
+        yield watcher.poll(since_ts() if since_ts else None)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(wlk, 'gen_polls', gen_polls)
+    args = argparse.Namespace(wlk_files=patterns, start=None, vantage_model=2,
+                              vantage_iss_id=1, to_database=False, output=str(output),
+                              poll_interval=0)
+    wlk.follow(args)
+
+
+def _read_csv(output) -> list[int]:
+    with open(output, newline='') as fd:
+        return [int(row['dateTime']) for row in csv.DictReader(fd)]
+
+
+def test_follow_resumes_csv(monkeypatch, tmp_path, source, watched):
+    expected = [record['dateTime'] for record in wlk.gen_wlk(source)]
+    path = watched / source.name
+    output = tmp_path / 'out.csv'
+    write_partial(source, path, 2, 20)
+    _follow(monkeypatch, [str(path)], output)
+    count = len(_read_csv(output))
+    # Run again on the same file, then on the whole of it.
+    _follow(monkeypatch, [str(path)], output)
+    assert len(_read_csv(output)) == count
+    write_partial(source, path, 3, 50)
+    _follow(monkeypatch, [str(path)], output)
+    assert _read_csv(output) == expected[:len(_read_csv(output))]
+    assert len(_read_csv(output)) > count
+
+
+def test_follow_drops_partial_line(monkeypatch, tmp_path, source, watched):
+    expected = [record['dateTime'] for record in wlk.gen_wlk(source)]
+    path = watched / source.name
+    output = tmp_path / 'out.csv'
+    write_partial(source, path, 2, 20)
+    _follow(monkeypatch, [str(path)], output)
+    count = len(_read_csv(output))
+    # A run killed part way through writing a row
+    with open(output, 'a') as fd:
+        fd.write(f"{expected[count]},1,")
+    write_partial(source, path, 3, 50)
+    _follow(monkeypatch, [str(path)], output)
+    assert _read_csv(output) == expected[:len(_read_csv(output))]
+
+
+def test_driver_watch(source, watched):
+    expected = list(wlk.gen_wlk(source))
+    path = watched / source.name
+    write_partial(source, path, 2, 20)
+    driver = wlk.WLKDriver({'wlk_files': str(watched / '*.wlk'), 'watch': 'true',
+                            'poll_interval': '0'})
+    records = list(driver.genArchiveRecords(None))
+    assert driver.caught_up
+    assert records == expected[:len(records)]
+    # Nothing new
+    assert list(driver.genArchiveRecords(records[-1]['dateTime'])) == []
+    write_partial(source, path, 3, 10)
+    new = list(driver.genArchiveRecords(records[-1]['dateTime']))
+    assert records + new == expected[:len(records) + len(new)]
+    assert new
@@ -0,0 +1,80 @@
+#
+#    Copyright (c) 2026 Tom Keffer <tkeffer@gmail.com>
+#
+#    See the file LICENSE.txt for your full rights.
+#
+"""Random access to the days of a file with WLKFile."""
+import gc
+import warnings
+
+import pytest
+
+from synthetic_wlk import wlk, write_wlk
+
+
+@pytest.fixture
+def path(tmp_path):
+    return write_wlk(tmp_path, 2018, 3, interval=60, days=[1, 2, 10, 11])
+
+
+@pytest.fixture
+def by_day(path):
+    return dict(wlk.gen_wlk_days(path, 2, 1, None, None))
+
+
+def test_days(path):
+    with wlk.WLKFile(path) as wlk_file:
+        assert wlk_file.days() == [1, 2, 10, 11]
+        assert wlk_file.total_records == 4 * (24 + 2)
+        assert (wlk_file.year, wlk_file.month) == (2018, 3)
+
+
+def test_records(path, by_day):
+    with wlk.WLKFile(path) as wlk_file:
+        for day in (1, 2, 10, 11):
+            assert wlk_file.records(day) == by_day[day]
+            assert wlk_file[day] == by_day[day]
+        assert wlk_file[5] == []
+        assert list(wlk_file) == list(wlk.gen_wlk(path))
+
+
+def test_records_since(path, by_day):
+    since_ts = by_day[10][11]['dateTime']
+    with wlk.WLKFile(path) as wlk_file:
+        assert wlk_file.records(10, since_ts) == by_day[10][12:]
+        assert wlk_file.records(2, since_ts) == []
+
+
+@pytest.mark.parametrize('day', [0, 32, -1])
+def test_bounds(path, day):
+    with wlk.WLKFile(path) as wlk_file:
+        with pytest.raises(IndexError):
+            wlk_file[day]
+
+
+def test_between(path, by_day):
+    records = list(wlk.gen_wlk(path))
+    with wlk.WLKFile(path) as wlk_file:
+        assert wlk_file.between() == records
+        start_ts, stop_ts = by_day[2][5]['dateTime'], by_day[10][3]['dateTime']
+        assert wlk_file.between(start_ts, stop_ts) \
+            == [r for r in records if start_ts < r['dateTime'] <= stop_ts]
+        assert wlk_file.between(stop_ts=by_day[1][0]['dateTime']) == by_day[1][:1]
+        assert wlk_file.between(start_ts=records[-1]['dateTime']) == []
+
+
+def test_too_short(tmp_path):
+    path = tmp_path / '2018-01.wlk'
+    path.write_bytes(b'WDAT5.0')
+    with pytest.raises(ValueError):
+        wlk.WLKFile(path)
+
+
+def test_closes_on_bad_header(path):
+    path.write_bytes(b'XXXXXX' + path.read_bytes()[6:])
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always', ResourceWarning)
+        with pytest.raises(ValueError):
+            wlk.WLKFile(path)
+        gc.collect()
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]